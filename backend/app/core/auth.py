@@ -1,12 +1,18 @@
 """Auth utilities and dependencies for admin dashboard"""
 from datetime import datetime, timezone, timedelta
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
+from typing import Optional
 from app.core.config import settings
 
 security = HTTPBearer(auto_error=False)
 
+# Tokens for the order event stream travel in the URL (and so into access logs):
+# they are scoped to the stream and only valid long enough to open a connection
+STREAM_TOKEN_ROLE = "order_stream"
+STREAM_TOKEN_EXPIRE_SECONDS = 60
+
 
 def create_access_token(sub: str) -> str:
     """Create JWT for admin user."""
@@ -19,6 +25,17 @@ def create_access_token(sub: str) -> str:
     )
 
 
+def create_stream_token(sub: str) -> str:
+    """Create a short-lived JWT that only opens the dashboard order stream."""
+    expire = datetime.now(timezone.utc) + timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    payload = {"sub": sub, "role": STREAM_TOKEN_ROLE, "exp": expire}
+    return jwt.encode(
+        payload,
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+
+
 def decode_token(token: str) -> dict:
     """Decode and validate JWT; raises on invalid/expired."""
     try:
@@ -57,3 +74,22 @@ async def get_current_admin(
             detail="Admin access required",
         )
     return payload
+
+
+async def get_stream_admin(
+    token: Optional[str] = Query(None),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict:
+    """Like get_current_admin, but also accepts a stream token as ?token= (EventSource cannot send headers).
+
+    Only tokens from create_stream_token are accepted in the URL, never the admin JWT itself.
+    """
+    if credentials or not token:
+        return await get_current_admin(credentials)
+    payload = decode_token(token)
+    if payload.get("role") != STREAM_TOKEN_ROLE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Stream token required",
+        )
+    return payload
@@ -0,0 +1,220 @@
+"""In-process snapshot cache for public content reads"""
+import asyncio
+import contextvars
+import gzip
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Mapping, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip and identity are always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are not worth compressing (same cut-off as GZipMiddleware)
+MIN_COMPRESS_SIZE = 500
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Ready-to-send JSON body, its pre-compressed forms and the strong ETag."""
+    body: bytes
+    etag: str
+    gzip: Optional[bytes] = None
+    br: Optional[bytes] = None
+
+
+def _json_default(value: Any) -> Any:
+    """Encode what json.dumps can't natively; plain Mongo documents never get here."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return jsonable_encoder(value)
+
+
+def encode_snapshot(payload: Any, compress: bool = True) -> Snapshot:
+    """Serialize and compress a payload once, with the same JSON settings as FastAPI's JSONResponse.
+
+    Plain dicts and lists (trusted Mongo reads) are encoded directly; models,
+    frozen mappings and datetimes go through the default hook. ``compress=False``
+    skips the costly compressed forms for payloads that are not kept.
+    """
+    body = json.dumps(
+        payload,
+        default=_json_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    if not compress or len(body) < MIN_COMPRESS_SIZE:
+        return Snapshot(body=body, etag=etag)
+    # Maximum levels are affordable here: this runs once per content change, not per request
+    return Snapshot(
+        body=body,
+        etag=etag,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        br=brotli.compress(body, quality=11) if brotli else None,
+    )
+
+
+@dataclass(frozen=True)
+class Fallback:
+    """Builder result made from default content because a read failed.
+
+    The cache never stores it, so the next request retries MongoDB instead of
+    serving placeholders for a whole TTL. Callers get it back still wrapped
+    (around the last good snapshot, if the cache still holds one) so the
+    response can be marked as not cacheable downstream either.
+    """
+    value: Any
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    stale_until: float
+    collections: FrozenSet[str]
+
+
+class SnapshotCache:
+    """Keyed snapshots of assembled read payloads.
+
+    Every entry remembers which collections it was built from, and a write to
+    any of them drops it. Entries also expire after ``ttl`` seconds so that
+    writes handled by another worker process are picked up eventually.
+
+    An expired entry stays servable for another ``stale_ttl`` seconds: callers
+    get it immediately while a single background task rebuilds it
+    (stale-while-revalidate). Only a missing or invalidated key blocks.
+    Builders that could not read MongoDB return a ``Fallback``, which is
+    passed back to the caller but never replaces a stored snapshot.
+
+    Pinned values (static snapshot mode) never expire and ignore writes.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[str, _Entry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._pinned: Dict[str, Any] = {}
+        self._written_at: Dict[str, float] = {}
+        self._generation = 0
+
+    def _fresh(self, key: str):
+        entry = self._entries.get(key)
+        if entry and entry.expires_at > time.monotonic():
+            return entry
+        return None
+
+    def _store(self, key: str, value: Any, collections: Iterable[str]) -> None:
+        now = time.monotonic()
+        self._entries[key] = _Entry(
+            value=value,
+            expires_at=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+            collections=frozenset(collections),
+        )
+
+    async def _rebuild(self, key: str, builder: Callable[[], Awaitable[Any]], collections: Iterable[str]) -> Any:
+        generation = self._generation
+        value = await builder()
+        if isinstance(value, Fallback):
+            # Keep the previous snapshot, however old: real content beats placeholders
+            entry = self._entries.get(key)
+            logger.warning(f"Rebuild of {key} fell back to defaults; not caching it")
+            return Fallback(entry.value) if entry else value
+        # A write landed while we were reading; don't pin pre-write data
+        if generation == self._generation:
+            self._store(key, value, collections)
+        return value
+
+    async def _refresh(self, key: str, builder: Callable[[], Awaitable[Any]], collections: Iterable[str]) -> None:
+        try:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                if not self._fresh(key):
+                    await self._rebuild(key, builder, collections)
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def get_or_build(
+        self,
+        key: str,
+        builder: Callable[[], Awaitable[Any]],
+        collections: Iterable[str],
+    ) -> Any:
+        """Return the cached value for key, building it once on a miss.
+
+        A degraded build comes back as a ``Fallback``.
+        """
+        if key in self._pinned:
+            return self._pinned[key]
+        entry = self._entries.get(key)
+        if entry:
+            now = time.monotonic()
+            if entry.expires_at > now:
+                return entry.value
+            if entry.stale_until > now:
+                if key not in self._refreshing:
+                    # Fresh context: the refresh's DB work must not be billed to this request
+                    self._refreshing[key] = asyncio.create_task(
+                        self._refresh(key, builder, collections),
+                        context=contextvars.Context(),
+                    )
+                return entry.value
+
+        # Only one coroutine rebuilds a key; the rest wait and reuse its result
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._fresh(key)
+            if entry:
+                return entry.value
+            return await self._rebuild(key, builder, collections)
+
+    def pin(self, key: str, value: Any) -> None:
+        """Serve value for key for the life of the process."""
+        self._pinned[key] = value
+
+    def pinned(self, key: str) -> Optional[Any]:
+        """Return the pinned value for key, if any."""
+        return self._pinned.get(key)
+
+    def invalidate(self, collection: str) -> None:
+        """Record a write to collection and drop every snapshot built from it."""
+        self._generation += 1
+        self._written_at[collection] = time.monotonic()
+        stale = [key for key, entry in self._entries.items() if collection in entry.collections]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            logger.info(f"Invalidated {len(stale)} cached snapshot(s) after write to {collection}")
+
+    def written_within(self, collection: str, seconds: float) -> bool:
+        """Whether this process wrote to collection in the last ``seconds``."""
+        written_at = self._written_at.get(collection)
+        return written_at is not None and time.monotonic() - written_at < seconds
+
+    def clear(self) -> None:
+        """Drop every snapshot."""
+        self._generation += 1
+        self._entries.clear()
+
+
+content_cache = SnapshotCache(
+    ttl=settings.CONTENT_CACHE_TTL_SECONDS,
+    stale_ttl=settings.CONTENT_CACHE_STALE_SECONDS,
+)
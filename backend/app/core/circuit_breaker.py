@@ -0,0 +1,156 @@
+"""Circuit breaker around the shared MongoDB handle
+
+When MongoDB is unreachable every query waits for server selection to time
+out before the routes fall back to their defaults. After enough consecutive
+connection failures the breaker opens and calls fail immediately with
+DatabaseUnavailable; a single background ping then decides when to close it.
+"""
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from motor.motor_asyncio import (
+    AsyncIOMotorChangeStream,
+    AsyncIOMotorCollection,
+    AsyncIOMotorCommandCursor,
+    AsyncIOMotorCursor,
+    AsyncIOMotorDatabase,
+    AsyncIOMotorLatentCommandCursor,
+)
+from pymongo.errors import ConnectionFailure
+
+from app.core.memory_db import MemoryCollection, MemoryCursor, MemoryDatabase
+
+logger = logging.getLogger(__name__)
+
+# The in-memory backend's types are guarded too, so hermetic runs exercise the same wrapping
+_HANDLE_TYPES = (AsyncIOMotorDatabase, AsyncIOMotorCollection, MemoryDatabase, MemoryCollection)
+_CURSOR_TYPES = (
+    AsyncIOMotorCursor,
+    AsyncIOMotorCommandCursor,
+    AsyncIOMotorLatentCommandCursor,
+    AsyncIOMotorChangeStream,
+    MemoryCursor,
+)
+
+
+class DatabaseUnavailable(ConnectionFailure):
+    """Raised without touching the network while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Counts consecutive connection failures and short-circuits calls once open."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        probe: Callable[[], Awaitable[Any]],
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._probe = probe
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_call(self) -> None:
+        """Raise DatabaseUnavailable if open, starting a recovery probe when one is due."""
+        if self._opened_at is None:
+            return
+        due = time.monotonic() - self._opened_at >= self.reset_timeout
+        if due and self._probe_task is None:
+            self._probe_task = asyncio.get_running_loop().create_task(self._run_probe())
+        raise DatabaseUnavailable("MongoDB circuit breaker is open")
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is None and self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            logger.warning(
+                f"MongoDB circuit breaker opened after {self._failures} consecutive failures; "
+                f"serving fallbacks for at least {self.reset_timeout}s"
+            )
+
+    async def guard(self, awaitable: Awaitable[Any]) -> Any:
+        """Await a database operation, recording whether the server was reachable."""
+        try:
+            result = await awaitable
+        except ConnectionFailure:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    async def _run_probe(self) -> None:
+        try:
+            await self._probe()
+        except Exception as e:
+            logger.warning(f"MongoDB recovery probe failed: {e}")
+            self._opened_at = time.monotonic()
+        else:
+            logger.info("MongoDB recovery probe succeeded; circuit breaker closed")
+            self._opened_at = None
+            self._failures = 0
+        finally:
+            self._probe_task = None
+
+
+class GuardedHandle:
+    """Proxy for a Motor database or collection that routes every call through a breaker."""
+
+    __slots__ = ("_target", "_breaker")
+
+    def __init__(self, target: Any, breaker: CircuitBreaker):
+        self._target = target
+        self._breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:
+        return self._wrap(getattr(self._target, name))
+
+    def __getitem__(self, name: str) -> Any:
+        return self._wrap(self._target[name])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._target!r})"
+
+    def _wrap(self, value: Any) -> Any:
+        breaker = self._breaker
+        if isinstance(value, _HANDLE_TYPES):
+            return GuardedHandle(value, breaker)
+        if isinstance(value, _CURSOR_TYPES):
+            return GuardedCursor(value, breaker)
+        if inspect.isawaitable(value):
+            return breaker.guard(value)
+        if callable(value) and not isinstance(value, type):
+            def call(*args, **kwargs):
+                breaker.before_call()
+                return self._wrap(value(*args, **kwargs))
+            return call
+        return value
+
+
+class GuardedCursor(GuardedHandle):
+    """Cursor proxy; also guards ``async for`` iteration."""
+
+    __slots__ = ()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        self._breaker.before_call()
+        return await self._breaker.guard(self._target.__anext__())
+
+    async def close(self):
+        # Releasing the server cursor must not be refused by an open circuit
+        await self._target.close()
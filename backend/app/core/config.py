@@ -13,6 +13,36 @@ class Settings:
     # MongoDB Settings
     MONGO_URL: str = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
     DB_NAME: str = os.environ.get('DB_NAME', 'portfolio_db')
+    # mongo, or memory for a process-local fake (benchmarks and tests; data is lost on exit)
+    MONGO_BACKEND: str = os.environ.get('MONGO_BACKEND', 'mongo')
+    MONGO_MEMORY_LATENCY_MS: float = float(os.environ.get('MONGO_MEMORY_LATENCY_MS', '0'))
+    MONGO_MEMORY_SEED: bool = os.environ.get('MONGO_MEMORY_SEED', 'true').lower() == 'true'
+    # Connection pool (0 disables the idle / wait-queue timeouts)
+    MONGO_MAX_POOL_SIZE: int = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+    MONGO_MIN_POOL_SIZE: int = int(os.environ.get('MONGO_MIN_POOL_SIZE', '5'))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000'))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000'))
+    # Public content reads prefer secondaries lagging at most this long (>= 90, or -1 for no bound)
+    MONGO_READ_MAX_STALENESS_SECONDS: int = int(os.environ.get('MONGO_READ_MAX_STALENESS_SECONDS', '90'))
+    # Consecutive connection failures before MongoDB calls fail fast, and seconds between recovery pings
+    DB_BREAKER_FAILURE_THRESHOLD: int = int(os.environ.get('DB_BREAKER_FAILURE_THRESHOLD', '3'))
+    DB_BREAKER_RESET_SECONDS: float = float(os.environ.get('DB_BREAKER_RESET_SECONDS', '5'))
+    # Create missing indexes from app/core/indexes.py when the app starts
+    MONGO_ENSURE_INDEXES: bool = os.environ.get('MONGO_ENSURE_INDEXES', 'true').lower() == 'true'
+    # Dev/staging: log commands slower than MONGO_SLOW_QUERY_MS and explain each new query shape
+    MONGO_QUERY_PROFILING: bool = os.environ.get('MONGO_QUERY_PROFILING', 'false').lower() == 'true'
+    MONGO_SLOW_QUERY_MS: float = float(os.environ.get('MONGO_SLOW_QUERY_MS', '100'))
+    # Debug: send each request's MongoDB time as a Server-Timing header (visible to every client)
+    DB_SERVER_TIMING: bool = os.environ.get('DB_SERVER_TIMING', 'false').lower() == 'true'
+    # Feed the dashboard order stream from a MongoDB change stream (replica set) instead of this worker's writes
+    ORDER_EVENTS_CHANGE_STREAM: bool = os.environ.get('ORDER_EVENTS_CHANGE_STREAM', 'false').lower() == 'true'
+    
+    # Content cache (public read endpoints)
+    CONTENT_CACHE_TTL_SECONDS: int = int(os.environ.get('CONTENT_CACHE_TTL_SECONDS', '60'))
+    CONTENT_CACHE_STALE_SECONDS: int = int(os.environ.get('CONTENT_CACHE_STALE_SECONDS', '300'))
+    BOOTSTRAP_FETCH_MODE: str = os.environ.get('BOOTSTRAP_FETCH_MODE', 'gather')  # gather or aggregate (MongoDB 4.4+)
+    # Directory written by export_static.py; when set, public content is served from it
+    STATIC_SNAPSHOT_DIR: str = os.environ.get('STATIC_SNAPSHOT_DIR', '')
     
     # CORS Settings
     CORS_ORIGINS: list = os.environ.get('CORS_ORIGINS', '*').split(',')
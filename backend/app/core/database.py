@@ -1,13 +1,114 @@
 """Database connection and utilities"""
+import asyncio
+from functools import lru_cache
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_preferences import SecondaryPreferred
+from app.core.cache import content_cache
+from app.core.circuit_breaker import CircuitBreaker, GuardedHandle
 from app.core.config import settings
+from app.core.memory_db import MemoryClient
+from app.core.monitoring import command_metrics, pool_stats
+from app.core.query_profiler import query_profiler
 import logging
 
 logger = logging.getLogger(__name__)
 
-# MongoDB client - short timeout so we fail fast when DB is down and return defaults quickly
-client = AsyncIOMotorClient(settings.MONGO_URL, serverSelectionTimeoutMS=1500)
-db = client[settings.DB_NAME]
+if settings.MONGO_BACKEND == "memory":
+    # Hermetic runs: no server, no driver events (pool and command metrics stay at zero)
+    client = MemoryClient(latency_ms=settings.MONGO_MEMORY_LATENCY_MS)
+else:
+    # MongoDB client - short timeout so we fail fast when DB is down and return defaults quickly
+    client = AsyncIOMotorClient(
+        settings.MONGO_URL,
+        serverSelectionTimeoutMS=1500,
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS or None,
+        waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS or None,
+        event_listeners=[pool_stats, command_metrics] + ([query_profiler] if settings.MONGO_QUERY_PROFILING else []),
+    )
+
+# Once the DB has failed a few times in a row, skip the 1.5s wait entirely until a ping succeeds
+db_breaker = CircuitBreaker(
+    failure_threshold=settings.DB_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.DB_BREAKER_RESET_SECONDS,
+    probe=lambda: client.admin.command("ping"),
+)
+db = GuardedHandle(client[settings.DB_NAME], db_breaker)
+
+# Public content reads may be served by a secondary, within a bounded replication lag.
+# Dashboard, checkout and order reads keep using the primary through `db`.
+content_db = GuardedHandle(
+    client.get_database(
+        settings.DB_NAME,
+        read_preference=SecondaryPreferred(max_staleness=settings.MONGO_READ_MAX_STALENESS_SECONDS),
+    ),
+    db_breaker,
+)
+
+
+def content_read_db(*collections: str):
+    """Handle for public content reads of the given collections.
+
+    Right after this process wrote to one of them, a secondary may still lag
+    behind; read from the primary until the staleness bound has passed so the
+    rebuilt snapshot reflects the write.
+    """
+    window = max(settings.MONGO_READ_MAX_STALENESS_SECONDS, 0)
+    if any(content_cache.written_within(name, window) for name in collections):
+        return db
+    return content_db
+
+
+@lru_cache(maxsize=None)
+def lean_projection(model) -> dict:
+    """Projection that returns exactly a model's fields and no _id.
+
+    Used by trusted read paths: documents were validated when written, so they
+    are encoded straight to JSON instead of being rebuilt as Pydantic models.
+    The returned dict is shared; don't mutate it.
+    """
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
+
+async def warm_up_pool():
+    """Open minPoolSize connections up front and verify each one with a ping.
+
+    Pings run concurrently so each needs its own connection; the first requests
+    after a deploy then skip TCP/TLS setup and server selection.
+    """
+    count = max(settings.MONGO_MIN_POOL_SIZE, 1)
+    try:
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(count)))
+        logger.info(f"MongoDB pool warmed up: {get_pool_stats()}")
+    except Exception as e:
+        logger.warning(f"MongoDB pool warmup failed: {e}")
+
+
+def start_query_profiler():
+    """Let the query profiler run explains on the running loop (no-op unless profiling is on)"""
+    if settings.MONGO_QUERY_PROFILING:
+        # Unguarded handle: a failing explain must not count towards opening the breaker
+        query_profiler.attach(asyncio.get_running_loop(), client[settings.DB_NAME])
+        logger.info(f"MongoDB query profiling on: logging commands over {settings.MONGO_SLOW_QUERY_MS}ms")
+
+
+def get_pool_stats() -> dict:
+    """Connection pool counters plus the configured limits"""
+    return {
+        **pool_stats.snapshot(),
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "breakerOpen": db_breaker.is_open,
+    }
+
+
+async def seed_memory_db():
+    """Load seed_data.py's content into the in-memory backend so reads exercise real queries"""
+    if settings.MONGO_BACKEND != "memory" or not settings.MONGO_MEMORY_SEED:
+        return
+    from seed_data import seed_database
+    await seed_database()
 
 
 async def close_db():
@@ -0,0 +1,70 @@
+"""Registry of fallback content served when MongoDB is empty or unreachable"""
+import logging
+from types import MappingProxyType
+from typing import Any, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import Snapshot, encode_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Any:
+    """Deep-freeze JSON-shaped data: dicts become read-only mappings, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class DefaultsRegistry:
+    """Builds each registered default once, as immutable data plus its pre-encoded snapshot.
+
+    Route modules register a factory next to their ``_get_default_*`` helper;
+    fallback paths then hand out the shared frozen objects instead of
+    constructing and dumping fresh Pydantic models on every call.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._data: Dict[str, Any] = {}
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._built = False
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+        if self._built:
+            self._build_one(name)
+
+    def _build_one(self, name: str) -> None:
+        plain = jsonable_encoder(self._factories[name]())
+        self._data[name] = _freeze(plain)
+        self._snapshots[name] = encode_snapshot(plain)
+
+    def build(self) -> None:
+        """Materialize every registered default; called once at startup."""
+        for name in self._factories:
+            self._build_one(name)
+        self._built = True
+        logger.info(f"Built {len(self._factories)} default content set(s)")
+
+    def data(self, name: str) -> Any:
+        """Frozen default content for a collection."""
+        if not self._built:
+            self.build()
+        return self._data[name]
+
+    def snapshot(self, name: str) -> Snapshot:
+        """Pre-encoded default response body for a collection."""
+        if not self._built:
+            self.build()
+        return self._snapshots[name]
+
+    def is_default(self, value: Any) -> bool:
+        """Whether value is one of the shared default objects handed out by data() or snapshot()."""
+        return any(value is default for default in (*self._data.values(), *self._snapshots.values()))
+
+
+defaults = DefaultsRegistry()
@@ -0,0 +1,88 @@
+"""HTTP caching helpers: ETag validation, encoding negotiation and conditional GET responses"""
+from typing import Union
+
+from fastapi import Request, Response
+
+from app.core.cache import Fallback, Snapshot
+from app.core.config import settings
+
+# Clients and CDNs keep content exactly as long as the server-side snapshot cache does
+PUBLIC_CACHE_CONTROL = (
+    f"public, max-age={settings.CONTENT_CACHE_TTL_SECONDS}, "
+    f"stale-while-revalidate={settings.CONTENT_CACHE_STALE_SECONDS}"
+)
+# Defaults served during an outage must not be kept by browsers or CDNs
+DEGRADED_CACHE_CONTROL = "no-store"
+
+
+def _accepted_encodings(accept_encoding: str) -> dict:
+    """Parse Accept-Encoding into {coding: q}."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def _select_encoding(request: Request, snapshot: Snapshot):
+    """Pick the best pre-compressed body the client accepts: br, then gzip, then identity."""
+    accept_encoding = request.headers.get("accept-encoding")
+    if not accept_encoding:
+        return None, snapshot.body
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for coding, body in (("br", snapshot.br), ("gzip", snapshot.gzip)):
+        if body is not None and accepted.get(coding, wildcard) > 0:
+            return coding, body
+    return None, snapshot.body
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix is ignored.
+
+    Compressed variants carry the identity ETag with a coding suffix, and any
+    variant of the same content counts as a match.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate == opaque or candidate.startswith(opaque + "-"):
+            return True
+    return False
+
+
+def snapshot_response(
+    request: Request,
+    snapshot: Union[Snapshot, Fallback],
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+) -> Response:
+    """Send a cached snapshot, or a bodiless 304 when the client already has it.
+
+    A ``Fallback`` is sent with ``DEGRADED_CACHE_CONTROL`` instead.
+    """
+    if isinstance(snapshot, Fallback):
+        snapshot, cache_control = snapshot.value, DEGRADED_CACHE_CONTROL
+    encoding, body = _select_encoding(request, snapshot)
+    etag = snapshot.etag if encoding is None else f'{snapshot.etag[:-1]}-{encoding}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
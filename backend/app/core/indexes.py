@@ -0,0 +1,94 @@
+"""Declarative MongoDB index registry, applied at startup and by manage_indexes.py"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """One index the application relies on."""
+    collection: str
+    keys: Tuple[Tuple[str, object], ...]  # direction: 1, -1 or "text"
+    name: str
+    unique: bool = False
+
+    def describe(self) -> str:
+        fields = ", ".join(f"{field}: {direction}" for field, direction in self.keys)
+        return f"{self.collection}.{self.name} {{{fields}}}{' unique' if self.unique else ''}"
+
+
+INDEXES: Tuple[IndexSpec, ...] = (
+    # Orders: gateway lookups (get_order, webhooks, Razorpay verify, admin search) and keyset-paginated listings
+    IndexSpec("orders", (("paymentSessionId", ASCENDING),), "paymentSessionId_1"),
+    IndexSpec("orders", (("paymentIntentId", ASCENDING),), "paymentIntentId_1"),
+    # Admin search: anchored prefix regex on the lowercased email, word search on the name
+    IndexSpec("orders", (("customerEmailLower", ASCENDING),), "customerEmailLower_1"),
+    IndexSpec("orders", (("customerName", TEXT),), "customerName_text"),
+    IndexSpec("orders", (("createdAt", DESCENDING), ("_id", DESCENDING)), "createdAt_-1__id_-1"),
+    IndexSpec(
+        "orders",
+        (("status", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)),
+        "status_1_createdAt_-1__id_-1",
+    ),
+    # Product performance: per-day product counters summed over a date range
+    IndexSpec("product_sales", (("day", ASCENDING),), "day_1"),
+    # Content: lookups and deletes by public id, ordered listings
+    IndexSpec("projects", (("id", ASCENDING),), "id_1"),
+    IndexSpec("products", (("id", ASCENDING),), "id_1"),
+    IndexSpec("services", (("id", ASCENDING),), "id_1"),
+    IndexSpec("testimonials", (("id", ASCENDING),), "id_1"),
+    IndexSpec("nav_links", (("id", ASCENDING),), "id_1"),
+    IndexSpec("nav_links", (("order", ASCENDING),), "order_1"),
+    IndexSpec("stats", (("order", ASCENDING),), "order_1"),
+)
+
+
+def _normalize_key(info: dict) -> Tuple[Tuple[str, object], ...]:
+    """Key as declared: index_information() may report directions as floats, and reports
+    a text index as _fts/_ftsx with its fields listed under weights."""
+    key = []
+    for field, direction in info["key"]:
+        if field == "_fts":
+            key.extend((text_field, TEXT) for text_field in sorted(info.get("weights", {})))
+        elif field != "_ftsx":
+            key.append((field, int(direction) if isinstance(direction, (int, float)) else direction))
+    return tuple(key)
+
+
+async def sync_indexes(database, apply: bool = True) -> Dict[str, List[str]]:
+    """Compare the registry with the server, creating missing indexes when apply is set.
+
+    Conflicting definitions and indexes the registry does not know about are
+    only reported: dropping or rebuilding them is left to an operator.
+    """
+    report: Dict[str, List[str]] = {"created": [], "missing": [], "conflicting": [], "unmanaged": []}
+    by_collection: Dict[str, List[IndexSpec]] = {}
+    for spec in INDEXES:
+        by_collection.setdefault(spec.collection, []).append(spec)
+
+    for collection, specs in by_collection.items():
+        existing = await database[collection].index_information()
+        for spec in specs:
+            info = existing.get(spec.name)
+            if info is None:
+                if apply:
+                    await database[collection].create_index(list(spec.keys), name=spec.name, unique=spec.unique)
+                    report["created"].append(spec.describe())
+                else:
+                    report["missing"].append(spec.describe())
+            elif _normalize_key(info) != spec.keys or bool(info.get("unique")) != spec.unique:
+                report["conflicting"].append(f"{spec.describe()} (server has {info})")
+        managed = {spec.name for spec in specs} | {"_id_"}
+        for name in existing:
+            if name not in managed:
+                report["unmanaged"].append(f"{collection}.{name} {existing[name].get('key')}")
+
+    for kind, entries in report.items():
+        for entry in entries:
+            level = logging.INFO if kind == "created" else logging.WARNING
+            logger.log(level, f"Index {kind}: {entry}")
+    return report
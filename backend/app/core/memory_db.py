@@ -0,0 +1,862 @@
+"""In-memory stand-in for the Motor client, for benchmarks and tests without MongoDB
+
+Selected with MONGO_BACKEND=memory. Implements the subset of the Motor async
+API this project uses: find (with sort / skip / limit / to_list / async
+iteration), find_one, insert_one / insert_many, update_one / update_many,
+find_one_and_update, delete_one / delete_many, bulk_write, count_documents,
+distinct, aggregate with the common stages, index bookkeeping and the ping
+command. Data lives for the life of the
+process. MONGO_MEMORY_LATENCY_MS adds a fixed delay to every round trip so
+benchmarks see a realistic number of awaits rather than free queries.
+
+Not a MongoDB emulator: unique indexes are recorded but not enforced, and
+unsupported operators raise NotImplementedError instead of being ignored.
+"""
+import asyncio
+import copy
+import datetime
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import bson
+from bson import ObjectId
+from bson.regex import Regex
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import OperationFailure
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+_MISSING = object()
+
+# MongoDB's cross-type sort order (numbers compare with each other regardless of int/float)
+_TYPE_ORDER = (
+    (type(None), 1),
+    ((int, float), 2),
+    (str, 3),
+    (Mapping, 4),
+    ((list, tuple), 5),
+    (bytes, 6),
+    (ObjectId, 7),
+    (bool, 8),
+    (datetime.datetime, 9),
+)
+
+
+def _type_rank(value: Any) -> int:
+    if value is _MISSING:
+        return 0
+    if isinstance(value, bool):  # before int: bool is an int subclass
+        return 8
+    for types, rank in _TYPE_ORDER:
+        if isinstance(value, types):
+            return rank
+    return 10
+
+
+def _sort_key(value: Any):
+    rank = _type_rank(value)
+    if rank in (0, 1):
+        return (rank, 0)
+    if rank == 4:
+        return (rank, tuple((key, _sort_key(item)) for key, item in value.items()))
+    if rank == 5:
+        return (rank, tuple(_sort_key(item) for item in value))
+    if rank == 9 and value.tzinfo is not None:
+        # Stored datetimes are naive UTC, as pymongo returns them
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (rank, value)
+
+
+def _compare(left: Any, right: Any) -> Optional[int]:
+    """-1/0/1, or None when the values are of different BSON types (no match for $gt etc.)."""
+    if _type_rank(left) != _type_rank(right):
+        return None
+    left_key, right_key = _sort_key(left), _sort_key(right)
+    return (left_key > right_key) - (left_key < right_key)
+
+
+def _to_bson(value: Any) -> Any:
+    """Round-trip through BSON so stored values have exactly the types MongoDB would return."""
+    return bson.decode(bson.encode({"v": value}))["v"]
+
+
+def _get_path(document: Any, path: str) -> Any:
+    """Value at a dotted path; lists along the way yield the list of matches."""
+    value = document
+    for part in path.split("."):
+        if isinstance(value, Mapping):
+            value = value.get(part, _MISSING)
+        elif isinstance(value, list):
+            if part.isdigit():
+                index = int(part)
+                value = value[index] if index < len(value) else _MISSING
+            else:
+                found = [_get_path(item, part) for item in value if isinstance(item, Mapping)]
+                value = [item for item in found if item is not _MISSING] or _MISSING
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _set_path(document: dict, path: str, value: Any) -> None:
+    *parents, last = path.split(".")
+    target = document
+    for part in parents:
+        target = target.setdefault(part, {})
+    target[last] = value
+
+
+def _unset_path(document: dict, path: str) -> None:
+    *parents, last = path.split(".")
+    target = document
+    for part in parents:
+        target = target.get(part)
+        if not isinstance(target, dict):
+            return
+    target.pop(last, None)
+
+
+def _candidates(value: Any) -> List[Any]:
+    """A field matches a condition if the value or, for arrays, any element does."""
+    if isinstance(value, list):
+        return [value, *value]
+    return [value]
+
+
+def _regex(pattern: Any, options: str = "") -> "re.Pattern":
+    if isinstance(pattern, Regex):
+        return pattern.try_compile()
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    flags = 0
+    for option, flag in (("i", re.IGNORECASE), ("m", re.MULTILINE), ("s", re.DOTALL), ("x", re.VERBOSE)):
+        if option in options:
+            flags |= flag
+    return re.compile(pattern, flags)
+
+
+def _equals(value: Any, expected: Any) -> bool:
+    if isinstance(expected, (re.Pattern, Regex)):
+        return isinstance(value, str) and bool(_regex(expected).search(value))
+    if expected is None:
+        return value is None or value is _MISSING
+    return any(
+        candidate is not _MISSING and _compare(candidate, expected) == 0
+        for candidate in _candidates(value)
+    )
+
+
+def _match_operator(value: Any, operator: str, operand: Any, condition: Mapping) -> bool:
+    if operator == "$eq":
+        return _equals(value, operand)
+    if operator == "$ne":
+        return not _equals(value, operand)
+    if operator in ("$gt", "$gte", "$lt", "$lte"):
+        wanted = {"$gt": (1,), "$gte": (0, 1), "$lt": (-1,), "$lte": (-1, 0)}[operator]
+        return any(
+            candidate is not _MISSING and _compare(candidate, operand) in wanted
+            for candidate in _candidates(value)
+        )
+    if operator == "$in":
+        return any(_equals(value, item) for item in operand)
+    if operator == "$nin":
+        return not any(_equals(value, item) for item in operand)
+    if operator == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    if operator == "$regex":
+        pattern = _regex(operand, condition.get("$options", ""))
+        return any(isinstance(candidate, str) and pattern.search(candidate) for candidate in _candidates(value))
+    if operator == "$options":
+        return True
+    if operator == "$not":
+        return not _match_condition(value, operand)
+    if operator == "$type":
+        names = {"string": str, "double": float, "int": int, "bool": bool, "date": datetime.datetime,
+                 "objectId": ObjectId, "object": Mapping, "array": list, "null": type(None)}
+        wanted = operand if isinstance(operand, list) else [operand]
+        return value is not _MISSING and any(
+            isinstance(value, names[name]) and not (name == "int" and isinstance(value, bool)) for name in wanted
+        )
+    if operator == "$size":
+        return isinstance(value, list) and len(value) == operand
+    if operator == "$all":
+        return isinstance(value, list) and all(_equals(value, item) for item in operand)
+    if operator == "$elemMatch":
+        operators_only = all(key.startswith("$") for key in operand)
+        return isinstance(value, list) and any(
+            _match_condition(item, operand) if operators_only else isinstance(item, Mapping) and _matches(item, operand)
+            for item in value
+        )
+    raise NotImplementedError(f"Query operator {operator} is not supported by the in-memory backend")
+
+
+def _match_condition(value: Any, condition: Any) -> bool:
+    if isinstance(condition, Mapping) and condition and all(key.startswith("$") for key in condition):
+        return all(_match_operator(value, op, operand, condition) for op, operand in condition.items())
+    return _equals(value, condition)
+
+
+def _text_matches(document: Mapping, search: str, text_fields: Tuple[str, ...]) -> bool:
+    """$text: any search term appears as a word in any text-indexed field (no stemming or phrases)."""
+    if not text_fields:
+        raise OperationFailure("text index required for $text query")
+    terms = set(re.findall(r"\w+", search.lower()))
+    for field in text_fields:
+        value = _get_path(document, field)
+        for candidate in _candidates(value):
+            if isinstance(candidate, str) and terms & set(re.findall(r"\w+", candidate.lower())):
+                return True
+    return False
+
+
+def _matches(document: Mapping, query: Optional[Mapping], text_fields: Tuple[str, ...] = ()) -> bool:
+    """Whether document satisfies a MongoDB query filter."""
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            if not all(_matches(document, clause, text_fields) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(_matches(document, clause, text_fields) for clause in condition):
+                return False
+        elif key == "$nor":
+            if any(_matches(document, clause, text_fields) for clause in condition):
+                return False
+        elif key == "$text":
+            if not _text_matches(document, condition["$search"], text_fields):
+                return False
+        elif key.startswith("$"):
+            raise NotImplementedError(f"Query operator {key} is not supported by the in-memory backend")
+        elif not _match_condition(_get_path(document, key), condition):
+            return False
+    return True
+
+
+def _normalize_sort(key_or_list: Any, direction: Optional[int] = None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, 1 if direction is None else direction)]
+    if isinstance(key_or_list, Mapping):
+        return list(key_or_list.items())
+    return [(key, value) for key, value in key_or_list]
+
+
+def _sorted(documents: List[dict], sort: List[Tuple[str, int]]) -> List[dict]:
+    # Stable sorts applied from the least significant key give a compound ordering
+    for field, direction in reversed(sort):
+        documents = sorted(
+            documents,
+            key=lambda doc: _sort_key(_get_path(doc, field)),
+            reverse=direction == -1,
+        )
+    return documents
+
+
+def _project(document: dict, projection: Any) -> dict:
+    """Apply a find-style inclusion or exclusion projection."""
+    if projection is None:
+        return document
+    if not isinstance(projection, Mapping):
+        projection = {field: 1 for field in projection}
+    include_id = bool(projection.get("_id", 1))
+    fields = {field: flag for field, flag in projection.items() if field != "_id"}
+    if any(fields.values()):
+        result = {}
+        if include_id and "_id" in document:
+            result["_id"] = document["_id"]
+        for field in fields:
+            value = _get_path(document, field)
+            if value is not _MISSING:
+                _set_path(result, field, value)
+        return result
+    result = dict(document)
+    for field in fields:
+        _unset_path(result, field)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+def _apply_update(document: dict, update: Any, inserting: bool = False) -> bool:
+    """Apply update operators in place; returns whether anything changed."""
+    before = copy.deepcopy(document)
+    if isinstance(update, list):
+        # Update with an aggregation pipeline ($set / $unset stages computed from the document)
+        updated = _run_pipeline(None, [copy.deepcopy(document)], update)[0]
+        document.clear()
+        document.update(_to_bson(updated))
+        return document != before
+    if update and not any(key.startswith("$") for key in update):
+        # Replacement document
+        preserved_id = document.get("_id")
+        document.clear()
+        document.update(_to_bson(dict(update)))
+        if preserved_id is not None:
+            document["_id"] = preserved_id
+        return document != before
+    for operator, fields in update.items():
+        for path, operand in _to_bson(fields).items():
+            current = _get_path(document, path)
+            if operator == "$set":
+                _set_path(document, path, operand)
+            elif operator == "$setOnInsert":
+                if inserting:
+                    _set_path(document, path, operand)
+            elif operator == "$unset":
+                _unset_path(document, path)
+            elif operator == "$inc":
+                _set_path(document, path, (0 if current is _MISSING else current) + operand)
+            elif operator == "$max":
+                if current is _MISSING or _sort_key(operand) > _sort_key(current):
+                    _set_path(document, path, operand)
+            elif operator == "$min":
+                if current is _MISSING or _sort_key(operand) < _sort_key(current):
+                    _set_path(document, path, operand)
+            elif operator in ("$push", "$addToSet"):
+                items = operand["$each"] if isinstance(operand, Mapping) and "$each" in operand else [operand]
+                target = [] if current is _MISSING else list(current)
+                for item in items:
+                    if operator == "$push" or item not in target:
+                        target.append(item)
+                _set_path(document, path, target)
+            elif operator == "$pull":
+                if isinstance(current, list):
+                    _set_path(document, path, [item for item in current if not _match_condition(item, operand)])
+            else:
+                raise NotImplementedError(f"Update operator {operator} is not supported by the in-memory backend")
+    return document != before
+
+
+def _upsert_seed(query: Mapping) -> dict:
+    """The document an upsert starts from: the filter's equality conditions."""
+    seed: dict = {}
+    for key, condition in query.items():
+        if key.startswith("$"):
+            continue
+        if isinstance(condition, Mapping) and any(op.startswith("$") for op in condition):
+            if "$eq" in condition:
+                _set_path(seed, key, copy.deepcopy(condition["$eq"]))
+            continue
+        _set_path(seed, key, copy.deepcopy(condition))
+    return seed
+
+
+# --- Aggregation ------------------------------------------------------------
+
+def _evaluate(expression: Any, document: Mapping) -> Any:
+    """Evaluate an aggregation expression against a document."""
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = _get_path(document, expression[1:])
+        return None if value is _MISSING else value
+    if isinstance(expression, list):
+        return [_evaluate(item, document) for item in expression]
+    if not isinstance(expression, Mapping):
+        return expression
+    if len(expression) == 1:
+        (operator, args), = expression.items()
+        if operator.startswith("$"):
+            return _evaluate_operator(operator, args, document)
+    return {key: _evaluate(value, document) for key, value in expression.items()}
+
+
+def _evaluate_operator(operator: str, args: Any, document: Mapping) -> Any:
+    if operator == "$literal":
+        return args
+    values = [_evaluate(arg, document) for arg in args] if isinstance(args, list) else [_evaluate(args, document)]
+    if operator in ("$add", "$subtract", "$multiply", "$divide") and any(value is None for value in values):
+        return None
+    if operator == "$add":
+        return sum(values)
+    if operator == "$subtract":
+        return values[0] - values[1]
+    if operator == "$multiply":
+        result = 1
+        for value in values:
+            result *= value
+        return result
+    if operator == "$divide":
+        return values[0] / values[1] if values[1] else None
+    if operator == "$ifNull":
+        return next((value for value in values if value is not None), values[-1])
+    if operator == "$cond":
+        if isinstance(args, Mapping):
+            condition, then, otherwise = args["if"], args["then"], args["else"]
+        else:
+            condition, then, otherwise = args
+        return _evaluate(then, document) if _evaluate(condition, document) else _evaluate(otherwise, document)
+    if operator in ("$eq", "$ne", "$gt", "$gte", "$lt", "$lte"):
+        order = (_sort_key(values[0]) > _sort_key(values[1])) - (_sort_key(values[0]) < _sort_key(values[1]))
+        return {"$eq": order == 0, "$ne": order != 0, "$gt": order > 0, "$gte": order >= 0,
+                "$lt": order < 0, "$lte": order <= 0}[operator]
+    if operator == "$in":
+        return values[0] in values[1]
+    if operator == "$and":
+        return all(values)
+    if operator == "$or":
+        return any(values)
+    if operator == "$not":
+        return not values[0]
+    if operator == "$size":
+        return len(values[0])
+    if operator in ("$sum", "$avg", "$min", "$max"):
+        items = values[0] if len(values) == 1 and isinstance(values[0], list) else values
+        return _accumulate(operator, items)
+    if operator == "$toLower":
+        return (values[0] or "").lower()
+    if operator == "$trim":
+        value = _evaluate(args["input"], document)
+        return None if value is None else value.strip(args.get("chars"))
+    if operator == "$toString":
+        return None if values[0] is None else str(values[0])
+    if operator == "$dateToString":
+        date = _evaluate(args["date"], document)
+        if date is None:
+            return None
+        if date.tzinfo is not None:
+            date = date.astimezone(datetime.timezone.utc)
+        return date.strftime(args.get("format", "%Y-%m-%dT%H:%M:%S.%LZ").replace("%L", f"{date.microsecond // 1000:03d}"))
+    if operator == "$concat":
+        return None if any(value is None for value in values) else "".join(values)
+    raise NotImplementedError(f"Expression operator {operator} is not supported by the in-memory backend")
+
+
+def _accumulate(operator: str, values: List[Any]) -> Any:
+    if operator == "$sum":
+        return sum(value for value in values if isinstance(value, (int, float)) and not isinstance(value, bool))
+    if operator == "$avg":
+        numbers = [value for value in values if isinstance(value, (int, float)) and not isinstance(value, bool)]
+        return sum(numbers) / len(numbers) if numbers else None
+    present = [value for value in values if value is not None]
+    if operator == "$min":
+        return min(present, key=_sort_key) if present else None
+    if operator == "$max":
+        return max(present, key=_sort_key) if present else None
+    if operator == "$first":
+        return values[0] if values else None
+    if operator == "$last":
+        return values[-1] if values else None
+    if operator == "$push":
+        return list(values)
+    if operator == "$addToSet":
+        unique: List[Any] = []
+        for value in values:
+            if value not in unique:
+                unique.append(value)
+        return unique
+    raise NotImplementedError(f"Accumulator {operator} is not supported by the in-memory backend")
+
+
+def _group(documents: List[dict], spec: Mapping) -> List[dict]:
+    groups: Dict[Any, Tuple[Any, List[dict]]] = {}
+    for document in documents:
+        group_id = _evaluate(spec["_id"], document)
+        key = _sort_key(group_id)
+        groups.setdefault(key, (group_id, []))[1].append(document)
+    results = []
+    for group_id, members in groups.values():
+        row = {"_id": group_id}
+        for field, accumulator in spec.items():
+            if field == "_id":
+                continue
+            (operator, expression), = accumulator.items()
+            row[field] = _accumulate(operator, [_evaluate(expression, member) for member in members])
+        results.append(row)
+    return results
+
+
+def _project_stage(document: dict, spec: Mapping) -> dict:
+    """$project: plain 0/1 flags behave like a find projection; any other value is an expression."""
+    computed = {
+        field: value for field, value in spec.items()
+        if not (isinstance(value, (bool, int)) and value in (0, 1))
+    }
+    if not computed:
+        return _project(document, spec)
+    result = {}
+    if spec.get("_id", 1) and "_id" not in computed and "_id" in document:
+        result["_id"] = document["_id"]
+    for field, flag in spec.items():
+        if field not in computed and field != "_id" and flag:
+            value = _get_path(document, field)
+            if value is not _MISSING:
+                _set_path(result, field, value)
+    for field, expression in computed.items():
+        _set_path(result, field, _evaluate(expression, document))
+    return result
+
+
+def _unwind(documents: List[dict], spec: Any) -> List[dict]:
+    if isinstance(spec, str):
+        spec = {"path": spec}
+    path = spec["path"][1:]
+    keep_empty = spec.get("preserveNullAndEmptyArrays", False)
+    results = []
+    for document in documents:
+        value = _get_path(document, path)
+        if isinstance(value, list) and value:
+            for item in value:
+                row = copy.deepcopy(document)
+                _set_path(row, path, item)
+                results.append(row)
+        elif isinstance(value, list) or value is _MISSING or value is None:
+            if keep_empty:
+                results.append(document)
+        else:
+            results.append(document)
+    return results
+
+
+def _run_pipeline(database: "MemoryDatabase", documents: List[dict], pipeline: Iterable[Mapping]) -> List[dict]:
+    for stage in pipeline:
+        (name, spec), = stage.items()
+        if name == "$match":
+            documents = [doc for doc in documents if _matches(doc, spec)]
+        elif name == "$project":
+            documents = [_project_stage(doc, spec) for doc in documents]
+        elif name in ("$addFields", "$set"):
+            updated = []
+            for doc in documents:
+                row = dict(doc)
+                for field, expression in spec.items():
+                    _set_path(row, field, _evaluate(expression, doc))
+                updated.append(row)
+            documents = updated
+        elif name == "$unset":
+            fields = [spec] if isinstance(spec, str) else spec
+            documents = [_project(doc, {field: 0 for field in fields}) for doc in documents]
+        elif name == "$sort":
+            documents = _sorted(documents, list(spec.items()))
+        elif name == "$skip":
+            documents = documents[spec:]
+        elif name == "$limit":
+            documents = documents[:spec]
+        elif name == "$group":
+            documents = _group(documents, spec)
+        elif name == "$unwind":
+            documents = _unwind(documents, spec)
+        elif name == "$count":
+            documents = [{spec: len(documents)}] if documents else []
+        elif name == "$facet":
+            documents = [{
+                field: _run_pipeline(database, copy.deepcopy(documents), sub_pipeline)
+                for field, sub_pipeline in spec.items()
+            }]
+        elif name == "$unionWith":
+            if isinstance(spec, str):
+                spec = {"coll": spec}
+            other = database[spec["coll"]]._snapshot()
+            documents = documents + _run_pipeline(database, other, spec.get("pipeline", []))
+        else:
+            raise NotImplementedError(f"Aggregation stage {name} is not supported by the in-memory backend")
+    return documents
+
+
+# --- Motor-shaped API ---------------------------------------------------------
+
+class MemoryCursor:
+    """Lazily evaluated result set with the chaining and iteration API of a Motor cursor."""
+
+    def __init__(self, collection: "MemoryCollection", produce):
+        self._collection = collection
+        self._produce = produce
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._buffer: Optional[List[dict]] = None
+
+    def sort(self, key_or_list: Any, direction: Optional[int] = None) -> "MemoryCursor":
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, skip: int) -> "MemoryCursor":
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> "MemoryCursor":
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int) -> "MemoryCursor":
+        return self
+
+    def _results(self) -> List[dict]:
+        documents = self._produce()
+        if self._sort:
+            documents = _sorted(documents, self._sort)
+        documents = documents[self._skip:]
+        if self._limit:
+            documents = documents[:abs(self._limit)]
+        return documents
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        await self._collection.database._delay()
+        if self._buffer is None:
+            self._buffer = self._results()
+        count = len(self._buffer) if not length else length
+        taken, self._buffer = self._buffer[:count], self._buffer[count:]
+        return taken
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._buffer is None:
+            await self._collection.database._delay()
+            self._buffer = self._results()
+        if not self._buffer:
+            raise StopAsyncIteration
+        return self._buffer.pop(0)
+
+    next = __anext__
+
+    async def close(self) -> None:
+        self._buffer = []
+
+
+class MemoryCollection:
+    """One collection: a list of documents, copied in and out so callers never share state."""
+
+    def __init__(self, database: "MemoryDatabase", name: str):
+        self.database = database
+        self.name = name
+        self._documents: List[dict] = []
+        self._indexes: Dict[str, dict] = {"_id_": {"v": 2, "key": [("_id", 1)]}}
+
+    def __repr__(self) -> str:
+        return f"MemoryCollection({self.database.name!r}, {self.name!r})"
+
+    def _snapshot(self) -> List[dict]:
+        return copy.deepcopy(self._documents)
+
+    def _matching(self, query: Optional[Mapping]) -> List[dict]:
+        text_fields = tuple(
+            field
+            for index in self._indexes.values()
+            for field, direction in index["key"]
+            if direction == "text"
+        )
+        return [doc for doc in self._documents if _matches(doc, query, text_fields)]
+
+    def find(self, filter: Optional[Mapping] = None, projection: Any = None, *, sort=None, skip: int = 0, limit: int = 0, **kwargs) -> MemoryCursor:
+        cursor = MemoryCursor(
+            self,
+            lambda: [_project(copy.deepcopy(doc), projection) for doc in self._matching(filter)],
+        )
+        if sort:
+            cursor.sort(sort)
+        return cursor.skip(skip).limit(limit)
+
+    async def find_one(self, filter: Optional[Mapping] = None, projection: Any = None, *, sort=None, **kwargs) -> Optional[dict]:
+        if filter is not None and not isinstance(filter, Mapping):
+            filter = {"_id": filter}
+        rows = await self.find(filter, projection, sort=sort, limit=1).to_list(1)
+        return rows[0] if rows else None
+
+    async def count_documents(self, filter: Mapping, **kwargs) -> int:
+        await self.database._delay()
+        return len(self._matching(filter))
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        await self.database._delay()
+        return len(self._documents)
+
+    async def distinct(self, key: str, filter: Optional[Mapping] = None, **kwargs) -> List[Any]:
+        await self.database._delay()
+        values: List[Any] = []
+        for doc in self._matching(filter):
+            value = _get_path(doc, key)
+            for item in (value if isinstance(value, list) else [value]):
+                if item is not _MISSING and item not in values:
+                    values.append(copy.deepcopy(item))
+        return values
+
+    async def insert_one(self, document: dict, **kwargs) -> InsertOneResult:
+        await self.database._delay()
+        # Like pymongo, add the generated _id to the caller's document
+        document.setdefault("_id", ObjectId())
+        self._documents.append(_to_bson(document))
+        return InsertOneResult(document["_id"], True)
+
+    async def insert_many(self, documents: Iterable[dict], ordered: bool = True, **kwargs) -> InsertManyResult:
+        await self.database._delay()
+        ids = []
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            self._documents.append(_to_bson(document))
+            ids.append(document["_id"])
+        return InsertManyResult(ids, True)
+
+    def _update(self, query: Mapping, update: Mapping, upsert: bool, many: bool) -> UpdateResult:
+        matched = modified = 0
+        for doc in self._matching(query):
+            matched += 1
+            modified += _apply_update(doc, update)
+            if not many:
+                break
+        raw = {"n": matched, "nModified": modified, "ok": 1.0, "updatedExisting": matched > 0}
+        if not matched and upsert:
+            document = self._upsert(query, update)
+            raw.update(n=1, upserted=document["_id"])
+        return UpdateResult(raw, True)
+
+    def _upsert(self, query: Mapping, update: Mapping) -> dict:
+        document = _upsert_seed(query)
+        _apply_update(document, update, inserting=True)
+        document.setdefault("_id", ObjectId())
+        self._documents.append(document)
+        return document
+
+    async def update_one(self, filter: Mapping, update: Mapping, upsert: bool = False, **kwargs) -> UpdateResult:
+        await self.database._delay()
+        return self._update(filter, update, upsert, many=False)
+
+    async def update_many(self, filter: Mapping, update: Mapping, upsert: bool = False, **kwargs) -> UpdateResult:
+        await self.database._delay()
+        return self._update(filter, update, upsert, many=True)
+
+    async def replace_one(self, filter: Mapping, replacement: Mapping, upsert: bool = False, **kwargs) -> UpdateResult:
+        await self.database._delay()
+        return self._update(filter, replacement, upsert, many=False)
+
+    async def find_one_and_update(
+        self,
+        filter: Mapping,
+        update: Mapping,
+        projection: Any = None,
+        sort=None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        **kwargs,
+    ) -> Optional[dict]:
+        await self.database._delay()
+        matching = self._matching(filter)
+        if sort:
+            matching = _sorted(matching, _normalize_sort(sort))
+        if not matching:
+            if not upsert:
+                return None
+            document = self._upsert(filter, update)
+            return _project(copy.deepcopy(document), projection) if return_document == ReturnDocument.AFTER else None
+        document = matching[0]
+        before = copy.deepcopy(document)
+        _apply_update(document, update)
+        chosen = copy.deepcopy(document) if return_document == ReturnDocument.AFTER else before
+        return _project(chosen, projection)
+
+    async def bulk_write(self, requests: Iterable[Any], ordered: bool = True, **kwargs) -> BulkWriteResult:
+        await self.database._delay()
+        raw = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": [], "writeErrors": []}
+        for index, request in enumerate(requests):
+            if isinstance(request, InsertOne):
+                request._doc.setdefault("_id", ObjectId())
+                self._documents.append(_to_bson(request._doc))
+                raw["nInserted"] += 1
+            elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                result = self._update(request._filter, request._doc, request._upsert, many=isinstance(request, UpdateMany))
+                if result.upserted_id is not None:
+                    raw["nUpserted"] += 1
+                    raw["upserted"].append({"index": index, "_id": result.upserted_id})
+                else:
+                    raw["nMatched"] += result.matched_count
+                    raw["nModified"] += result.modified_count
+            elif isinstance(request, (DeleteOne, DeleteMany)):
+                raw["nRemoved"] += self._delete(request._filter, many=isinstance(request, DeleteMany)).deleted_count
+            else:
+                raise NotImplementedError(f"Bulk operation {type(request).__name__} is not supported by the in-memory backend")
+        return BulkWriteResult(raw, True)
+
+    def _delete(self, query: Mapping, many: bool) -> DeleteResult:
+        deleted = 0
+        for doc in self._matching(query):
+            self._documents.remove(doc)
+            deleted += 1
+            if not many:
+                break
+        return DeleteResult({"n": deleted, "ok": 1.0}, True)
+
+    async def delete_one(self, filter: Mapping, **kwargs) -> DeleteResult:
+        await self.database._delay()
+        return self._delete(filter, many=False)
+
+    async def delete_many(self, filter: Mapping, **kwargs) -> DeleteResult:
+        await self.database._delay()
+        return self._delete(filter, many=True)
+
+    def aggregate(self, pipeline: List[Mapping], **kwargs) -> MemoryCursor:
+        return MemoryCursor(self, lambda: _run_pipeline(self.database, self._snapshot(), pipeline))
+
+    async def create_index(self, keys: Any, name: Optional[str] = None, unique: bool = False, **kwargs) -> str:
+        await self.database._delay()
+        key = _normalize_sort(keys)
+        name = name or "_".join(f"{field}_{direction}" for field, direction in key)
+        self._indexes[name] = {"v": 2, "key": key, **({"unique": True} if unique else {})}
+        return name
+
+    async def index_information(self) -> Dict[str, dict]:
+        await self.database._delay()
+        return copy.deepcopy(self._indexes)
+
+    async def drop(self) -> None:
+        await self.database._delay()
+        self._documents.clear()
+
+
+class MemoryDatabase:
+    """Collections by attribute or item access, created on first use."""
+
+    def __init__(self, client: "MemoryClient", name: str):
+        self.client = client
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(self, name)
+        return self._collections[name]
+
+    def get_collection(self, name: str, **kwargs) -> MemoryCollection:
+        return self[name]
+
+    async def _delay(self) -> None:
+        if self.client.latency:
+            await asyncio.sleep(self.client.latency)
+
+    async def list_collection_names(self, **kwargs) -> List[str]:
+        await self._delay()
+        return list(self._collections)
+
+    async def command(self, command: Any, **kwargs) -> dict:
+        await self._delay()
+        name = command if isinstance(command, str) else next(iter(command))
+        if name in ("ping", "hello", "isMaster", "ismaster"):
+            return {"ok": 1.0}
+        raise NotImplementedError(f"Command {name} is not supported by the in-memory backend")
+
+
+class MemoryClient:
+    """Drop-in for AsyncIOMotorClient; databases share nothing with a real server."""
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency = latency_ms / 1000
+        self._databases: Dict[str, MemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(self, name)
+        return self._databases[name]
+
+    def __getattr__(self, name: str) -> MemoryDatabase:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_database(self, name: str, **kwargs) -> MemoryDatabase:
+        # Read preferences and concerns have no meaning for a single in-process copy
+        return self[name]
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,195 @@
+"""MongoDB driver event listeners"""
+import threading
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from pymongo import monitoring
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Running connection-pool counters, fed by the driver's pool events.
+
+    Events arrive on driver threads, so updates are serialized with a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {
+            "open": 0,
+            "checkedOut": 0,
+            "created": 0,
+            "closed": 0,
+            "checkOuts": 0,
+            "checkOutFailures": 0,
+            "poolsCleared": 0,
+        }
+
+    def _bump(self, **deltas) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self._counts[name] += delta
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._bump(poolsCleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._bump(created=1, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._bump(closed=1, open=-1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._bump(checkOutFailures=1)
+
+    def connection_checked_out(self, event):
+        self._bump(checkOuts=1, checkedOut=1)
+
+    def connection_checked_in(self, event):
+        self._bump(checkedOut=-1)
+
+
+pool_stats = PoolStats()
+
+
+class RequestDbStats:
+    """Database commands issued while serving one request."""
+
+    __slots__ = ("queries", "total_ms", "slowest_ms", "slowest")
+
+    def __init__(self):
+        self.queries = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest: Optional[str] = None
+
+
+# Set per request by the DB metrics middleware. Motor copies the context into the
+# executor thread that runs each driver call, so listeners can read it there.
+current_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("current_request_db_stats", default=None)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Attributes every driver command to the current request and aggregates per route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # request_id -> "operation collection", between started and succeeded/failed
+        self._pending: Dict[int, str] = {}
+        self._routes: Dict[str, dict] = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        label = f"{event.command_name} {target}" if isinstance(target, str) else event.command_name
+        with self._lock:
+            self._pending[event.request_id] = label
+
+    def _finished(self, event):
+        with self._lock:
+            label = self._pending.pop(event.request_id, event.command_name)
+        stats = current_request_db_stats.get()
+        if stats is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        with self._lock:
+            stats.queries += 1
+            stats.total_ms += duration_ms
+            if duration_ms >= stats.slowest_ms:
+                stats.slowest_ms = duration_ms
+                stats.slowest = label
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+
+    def record_request(self, route: str, stats: RequestDbStats) -> None:
+        """Fold one finished request into its route's aggregates."""
+        with self._lock:
+            agg = self._routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "dbTimeMs": 0.0,
+                "maxQueriesPerRequest": 0,
+                "slowestMs": 0.0,
+                "slowestCommand": None,
+            })
+            agg["requests"] += 1
+            agg["queries"] += stats.queries
+            agg["dbTimeMs"] += stats.total_ms
+            agg["maxQueriesPerRequest"] = max(agg["maxQueriesPerRequest"], stats.queries)
+            if stats.slowest is not None and stats.slowest_ms >= agg["slowestMs"]:
+                agg["slowestMs"] = stats.slowest_ms
+                agg["slowestCommand"] = stats.slowest
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per-route aggregates with averages, busiest DB time first."""
+        with self._lock:
+            routes = {route: dict(agg) for route, agg in self._routes.items()}
+        for agg in routes.values():
+            agg["avgQueriesPerRequest"] = round(agg["queries"] / agg["requests"], 2)
+            agg["avgDbTimeMs"] = round(agg["dbTimeMs"] / agg["requests"], 3)
+            agg["dbTimeMs"] = round(agg["dbTimeMs"], 3)
+            agg["slowestMs"] = round(agg["slowestMs"], 3)
+        return dict(sorted(routes.items(), key=lambda item: item[1]["dbTimeMs"], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+command_metrics = CommandMetrics()
+
+
+class DbMetricsMiddleware:
+    """Pure ASGI middleware attributing MongoDB commands to the request and route that issued them.
+
+    Unlike BaseHTTPMiddleware it adds no extra task or body streaming per
+    request, so cached responses stay cheap. With ``server_timing`` set, the
+    request's DB time is also sent as a Server-Timing header (debug aid: it
+    exposes backend timings to every client).
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestDbStats()
+        token = current_request_db_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                header = f'db;dur={stats.total_ms:.2f};desc="{stats.queries} queries"'
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing if self.server_timing else send)
+        finally:
+            current_request_db_stats.reset(token)
+            # The router records the matched route in the shared scope; unmatched paths share one bucket
+            path = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            command_metrics.record_request(f"{scope['method']} {path}", stats)
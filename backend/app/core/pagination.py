@@ -0,0 +1,74 @@
+"""Keyset (cursor) pagination for newest-first listings
+
+Pages are ordered by (createdAt, _id) descending. The cursor handed to the
+client encodes the last row's sort key, and the next page starts with an index
+seek just past it, so page 1000 costs the same as page 1 (unlike skip, which
+walks every earlier row). Backed by the {createdAt: -1, _id: -1} indexes.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DESCENDING
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Page size bounds for the paginated routes' limit parameter
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+KEYSET_SORT = [("createdAt", DESCENDING), ("_id", DESCENDING)]
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not produced by encode_cursor."""
+
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque cursor pointing just past doc."""
+    created_at = doc.get("createdAt")
+    key = {
+        "t": created_at.isoformat() if isinstance(created_at, datetime) else None,
+        "id": str(doc["_id"]),
+        "oid": isinstance(doc["_id"], ObjectId),
+    }
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], object]:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        created_at = datetime.fromisoformat(key["t"]) if key["t"] is not None else None
+        doc_id = ObjectId(key["id"]) if key["oid"] else key["id"]
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+    return created_at, doc_id
+
+
+def after_cursor(cursor: str) -> dict:
+    """Filter for the rows that sort after the cursor under KEYSET_SORT."""
+    created_at, doc_id = decode_cursor(cursor)
+    if created_at is None:
+        # Rows without createdAt sort last; only those with a smaller _id remain
+        return {"createdAt": None, "_id": {"$lt": doc_id}}
+    return {"$or": [
+        {"createdAt": {"$lt": created_at}},
+        {"createdAt": created_at, "_id": {"$lt": doc_id}},
+        {"createdAt": None},
+    ]}
+
+
+async def fetch_page(collection, query: dict, limit: int, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of query's matches, newest first, plus the cursor for the next page (None on the last)."""
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    if cursor:
+        query = {"$and": [query, after_cursor(cursor)]} if query else after_cursor(cursor)
+    # One extra row tells us whether another page exists without a count
+    docs = await collection.find(query).sort(KEYSET_SORT).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_cursor(docs[-1])
+    return docs, None
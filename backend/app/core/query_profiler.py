@@ -0,0 +1,198 @@
+"""Slow-query log and query-plan checks for development and staging
+
+Enabled with MONGO_QUERY_PROFILING. Every command slower than
+MONGO_SLOW_QUERY_MS is logged with its filter, sort and projection. The first
+time a query shape (collection, command, filter keys and operators, sort,
+projection) is seen it is explained once in the background, and plans that
+scan the whole collection (COLLSCAN) or sort in memory (SORT) are flagged.
+"""
+import asyncio
+import contextvars
+import json
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, Mapping, Optional, Set
+
+from pymongo import monitoring
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Command -> fields copied into the explain request (everything else is session/driver plumbing)
+_EXPLAINABLE = {
+    "find": ("find", "filter", "sort", "projection", "skip", "limit", "hint", "collation"),
+    "aggregate": ("aggregate", "pipeline", "cursor", "hint", "collation"),
+    "count": ("count", "query", "skip", "limit", "hint", "collation"),
+    "distinct": ("distinct", "key", "query", "collation"),
+    "findAndModify": ("findAndModify", "query", "sort", "fields", "update", "upsert", "remove", "new", "collation"),
+}
+# Commands that never touch user collections
+_IGNORED = {"explain", "hello", "isMaster", "ismaster", "ping", "endSessions", "buildInfo", "saslStart", "saslContinue"}
+# Plan stages worth a warning
+_FLAGGED_STAGES = {"COLLSCAN": "collection scan", "SORT": "in-memory sort"}
+# Parts of an explain document that describe plans which will not run
+_SKIPPED_EXPLAIN_KEYS = {"rejectedPlans", "command", "originalCommand", "parsedQuery"}
+
+MAX_SHAPES = 500
+MAX_SLOW_QUERIES = 100
+
+
+def _shape(value: Any) -> Any:
+    """Replace literal values with "?" so queries differing only in values share a shape."""
+    if isinstance(value, Mapping):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, Mapping) for item in value):
+            return [_shape(item) for item in value]
+        return "?"
+    return "?"
+
+
+def _plan_stages(explain: Any, found: Set[str]) -> Set[str]:
+    """Collect every stage name of the winning plan(s) in an explain result."""
+    if isinstance(explain, Mapping):
+        stage = explain.get("stage")
+        if isinstance(stage, str):
+            found.add(stage)
+        if "$sort" in explain:
+            # Aggregation $sort that could not be pushed down to the query layer
+            found.add("SORT")
+        for key, item in explain.items():
+            if key not in _SKIPPED_EXPLAIN_KEYS:
+                _plan_stages(item, found)
+    elif isinstance(explain, list):
+        for item in explain:
+            _plan_stages(item, found)
+    return found
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """Logs slow commands and explains each new query shape once.
+
+    Listener callbacks run on driver threads; explains are handed to the event
+    loop given to ``attach`` and run there in a context of their own, so they
+    are not counted against the request that triggered them.
+    """
+
+    def __init__(self, slow_ms: float):
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        # request_id -> (command name, collection, details for the log)
+        self._pending: Dict[int, tuple] = {}
+        self._plans: Dict[str, dict] = {}
+        self._slow = deque(maxlen=MAX_SLOW_QUERIES)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._database = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def attach(self, loop: asyncio.AbstractEventLoop, database) -> None:
+        """Run explains on loop against database (an unguarded Motor database)."""
+        self._loop = loop
+        self._database = database
+
+    def started(self, event):
+        name = event.command_name
+        if name in _IGNORED:
+            return
+        command = event.command
+        collection = command.get(name)
+        details = {}
+        if name == "aggregate":
+            details["pipeline"] = command.get("pipeline")
+        else:
+            for field in ("filter", "query", "sort", "projection", "fields"):
+                if field in command:
+                    details[field] = command[field]
+        with self._lock:
+            self._pending[event.request_id] = (name, collection, details)
+        if name in _EXPLAINABLE and isinstance(collection, str):
+            self._maybe_explain(name, collection, command)
+
+    def _finished(self, event):
+        with self._lock:
+            pending = self._pending.pop(event.request_id, None)
+        if pending is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.slow_ms:
+            return
+        name, collection, details = pending
+        described = " ".join(f"{field}={value}" for field, value in details.items())
+        logger.warning(f"Slow MongoDB {name} on {collection}: {duration_ms:.1f}ms {described}".rstrip())
+        with self._lock:
+            self._slow.append({
+                "command": name,
+                "collection": collection,
+                "durationMs": round(duration_ms, 3),
+                **{field: json.loads(json.dumps(value, default=str)) for field, value in details.items()},
+            })
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+
+    def _maybe_explain(self, name: str, collection: str, command: Mapping) -> None:
+        request = {field: command[field] for field in _EXPLAINABLE[name] if field in command}
+        shape_fields = {
+            field: value if field in ("sort", "projection", "fields") else _shape(value)
+            for field, value in request.items()
+            if field != name
+        }
+        key = json.dumps([collection, name, shape_fields], default=str)
+        with self._lock:
+            if key in self._plans or len(self._plans) >= MAX_SHAPES or self._loop is None:
+                return
+            self._plans[key] = {
+                "collection": collection,
+                "command": name,
+                "shape": json.loads(json.dumps(shape_fields, default=str)),
+                "stages": None,
+                "flags": [],
+            }
+        self._loop.call_soon_threadsafe(self._start_explain, key, request, context=contextvars.Context())
+
+    def _start_explain(self, key: str, request: dict) -> None:
+        task = self._loop.create_task(self._explain(key, request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, key: str, request: dict) -> None:
+        try:
+            result = await self._database.command({"explain": request, "verbosity": "queryPlanner"})
+        except Exception as e:
+            logger.info(f"Could not explain {request}: {e}")
+            return
+        stages = _plan_stages(result, set())
+        flags = [label for stage, label in _FLAGGED_STAGES.items() if stage in stages]
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:  # reset while the explain was running
+                return
+            plan["stages"] = sorted(stages)
+            plan["flags"] = flags
+        if flags:
+            logger.warning(
+                f"MongoDB {plan['command']} on {plan['collection']} uses {' and '.join(flags)}: "
+                f"{json.dumps(plan['shape'], default=str)}"
+            )
+
+    def snapshot(self) -> dict:
+        """Recent slow commands and the explained query shapes, flagged ones first."""
+        with self._lock:
+            slow = list(self._slow)
+            plans = [dict(plan) for plan in self._plans.values()]
+        plans.sort(key=lambda plan: not plan["flags"])
+        return {"slowMs": self.slow_ms, "slowQueries": slow, "queryShapes": plans}
+
+    def reset(self) -> None:
+        """Forget recorded slow commands and explained shapes (shapes are re-explained on next use)."""
+        with self._lock:
+            self._slow.clear()
+            self._plans.clear()
+
+
+query_profiler = QueryProfiler(slow_ms=settings.MONGO_SLOW_QUERY_MS)
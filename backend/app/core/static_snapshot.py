@@ -0,0 +1,48 @@
+"""Static snapshot mode: serve exported, content-hashed JSON files instead of querying MongoDB"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict
+
+from app.core.cache import Snapshot, content_cache
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+def write_snapshot(out_dir: Path, key: str, snapshot: Snapshot) -> Dict[str, str]:
+    """Write a snapshot and its compressed forms under content-hashed names; return its manifest entry."""
+    digest = snapshot.etag.strip('"')
+    entry = {"etag": snapshot.etag, "file": f"{key}.{digest}.json"}
+    (out_dir / entry["file"]).write_bytes(snapshot.body)
+    if snapshot.gzip is not None:
+        entry["gzip"] = entry["file"] + ".gz"
+        (out_dir / entry["gzip"]).write_bytes(snapshot.gzip)
+    if snapshot.br is not None:
+        entry["br"] = entry["file"] + ".br"
+        (out_dir / entry["br"]).write_bytes(snapshot.br)
+    return entry
+
+
+def write_manifest(out_dir: Path, entries: Dict[str, Dict[str, str]]) -> None:
+    """Atomically replace the manifest so a running export never leaves it half-written."""
+    tmp = out_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(entries, indent=2, sort_keys=True))
+    os.replace(tmp, out_dir / MANIFEST_NAME)
+
+
+def load_static_snapshots(directory: str) -> int:
+    """Read every exported snapshot into memory once and pin it in the content cache."""
+    root = Path(directory)
+    manifest = json.loads((root / MANIFEST_NAME).read_text())
+    for key, entry in manifest.items():
+        content_cache.pin(key, Snapshot(
+            body=(root / entry["file"]).read_bytes(),
+            etag=entry["etag"],
+            gzip=(root / entry["gzip"]).read_bytes() if "gzip" in entry else None,
+            br=(root / entry["br"]).read_bytes() if "br" in entry else None,
+        ))
+    logger.info(f"Static snapshot mode: serving {len(manifest)} snapshot(s) from {root}")
+    return len(manifest)
@@ -1,9 +1,17 @@
 """Main FastAPI application"""
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import close_db
+from app.core.database import client, close_db, db, seed_memory_db, start_query_profiler, warm_up_pool
+from app.core.defaults import defaults
+from app.core.indexes import sync_indexes
 from app.core.logging_config import setup_logging
+from app.core.monitoring import DbMetricsMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.static_snapshot import load_static_snapshots
+from app.services.order_events import watch_order_changes
 from app.routes import (
     personal_info,
     stats,
@@ -25,11 +33,45 @@ from app.routes import (
 # Setup logging
 logger = setup_logging()
 
+
+async def _ensure_indexes():
+    """Apply the index registry without holding up startup"""
+    try:
+        await sync_indexes(db)
+    except Exception as e:
+        logger.warning(f"Could not sync MongoDB indexes: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup: build fallback content, warm the DB pool, sync indexes, load static snapshots,
+    watch the orders change stream if enabled. Shutdown: stop background tasks, close the DB connection."""
+    defaults.build()
+    start_query_profiler()
+    if settings.STATIC_SNAPSHOT_DIR:
+        load_static_snapshots(settings.STATIC_SNAPSHOT_DIR)
+    await warm_up_pool()
+    await seed_memory_db()
+    index_sync = asyncio.create_task(_ensure_indexes()) if settings.MONGO_ENSURE_INDEXES else None
+    # Unguarded handle: the long-lived stream and its retries must not trip the circuit breaker
+    order_watch = (
+        asyncio.create_task(watch_order_changes(client[settings.DB_NAME]))
+        if settings.ORDER_EVENTS_CHANGE_STREAM else None
+    )
+    yield
+    for task in (index_sync, order_watch):
+        if task and not task.done():
+            task.cancel()
+    await close_db()
+    logger.info("Application shutdown complete")
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="A professional portfolio API"
+    description="A professional portfolio API",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -39,8 +81,15 @@ app.add_middleware(
     allow_origins=settings.CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read the pagination cursor
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+
+# Per-request MongoDB metrics (outermost, so it sees every request)
+app.add_middleware(DbMetricsMiddleware, server_timing=settings.DB_SERVER_TIMING)
+
+
 # Include routers
 app.include_router(personal_info.router, prefix=settings.API_V1_PREFIX)
 app.include_router(stats.router, prefix=settings.API_V1_PREFIX)
@@ -90,10 +139,3 @@ async def api_root():
             "checkout": f"{settings.API_V1_PREFIX}/checkout"
         }
     }
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    await close_db()
-    logger.info("Application shutdown complete")
@@ -4,6 +4,8 @@ from typing import Optional
 import uuid
 from datetime import datetime, timezone
 
+ORDER_STATUSES = ["pending", "paid", "failed", "cancelled", "refunded"]
+
 
 class OrderItem(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -18,7 +20,7 @@ class Order(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     items: list[OrderItem]
     total: float
-    status: str = "pending"  # pending, paid, failed, cancelled, refunded
+    status: str = "pending"  # one of ORDER_STATUSES
     paymentMethod: str = "stripe"  # stripe, paypal, razorpay
     paymentSessionId: Optional[str] = None  # Generic session ID for any payment gateway
     paymentIntentId: Optional[str] = None  # Generic payment intent ID
@@ -68,4 +70,57 @@ class PaymentStats(BaseModel):
     paidOrders: int
     failedOrders: int
     todayRevenue: float
-    todayOrders: int
\ No newline at end of file
+    todayOrders: int
+
+
+class RevenuePoint(BaseModel):
+    bucket: str  # label, e.g. 2024-05-01T13:00 (hour), 2024-05-01 (day), 2024-05 (month)
+    start: datetime  # UTC start of the bucket
+    orders: int
+    paidOrders: int
+    revenue: float
+
+
+class RevenueSeries(BaseModel):
+    granularity: str  # hour, day, month
+    start: datetime
+    end: datetime
+    points: list[RevenuePoint]
+
+
+class ProductPerformance(BaseModel):
+    productId: str
+    name: Optional[str] = None
+    orders: int  # orders listing the product, any status
+    paidOrders: int
+    units: int  # paid units
+    revenue: float  # paid line revenue (price x quantity)
+    conversion: float  # paidOrders / orders
+
+
+class ProductPerformanceReport(BaseModel):
+    start: datetime
+    end: datetime
+    sort: str  # revenue, units, orders, conversion
+    products: list[ProductPerformance]
+
+
+class BulkStatusItem(BaseModel):
+    id: str  # order _id or paymentSessionId, as accepted by the single-order endpoint
+    status: str
+
+
+class BulkStatusRequest(BaseModel):
+    updates: list[BulkStatusItem]
+
+
+class BulkStatusResult(BaseModel):
+    id: str
+    result: str  # updated, unchanged, conflict, not_found, invalid_status, duplicate
+    previousStatus: Optional[str] = None
+    status: Optional[str] = None
+
+
+class BulkStatusResponse(BaseModel):
+    updated: int
+    results: list[BulkStatusResult]
@@ -1,131 +1,236 @@
 """Bootstrap endpoint - returns all home-page data in one request for fast load"""
 import asyncio
+import json
 import logging
-from fastapi import APIRouter, Response
-
-from app.core.database import db
-from app.routes.personal_info import _get_default_personal_info
-from app.routes.stats import _get_default_stats
-from app.routes.services import _get_default_services
-from app.routes.projects import _get_default_projects
-from app.routes.products import _get_default_products
-from app.routes.testimonials import _get_default_testimonials
-from app.routes.skills import _get_default_skills
+from typing import Optional, Tuple
+from fastapi import APIRouter, HTTPException, Request
+
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.config import settings
+from app.core.database import content_read_db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
+from app.models.nav_links import NavLink
+from app.models.personal_info import PersonalInfo
+from app.models.products import Product
+from app.models.projects import Project
+from app.models.services import Service
+from app.models.skills import Skill
+from app.models.stats import Stat
+from app.models.testimonials import Testimonial
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
 
-_DEFAULT_NAV_LINKS = [
-    {"id": "1", "label": "Home", "href": "#home", "order": 0},
-    {"id": "2", "label": "Services", "href": "#services", "order": 1},
-    {"id": "3", "label": "Portfolio", "href": "#portfolio", "order": 2},
-    {"id": "4", "label": "Products", "href": "#products", "order": 3},
-    {"id": "5", "label": "Testimonials", "href": "#testimonials", "order": 4},
-    {"id": "6", "label": "Contact", "href": "#contact", "order": 5},
-]
-
 
 async def _fetch_personal_info():
     try:
-        info = await db.personal_info.find_one({}, {"_id": 0})
+        info = await content_read_db("personal_info").personal_info.find_one({}, lean_projection(PersonalInfo))
         if info:
             return info
     except Exception as e:
         logger.warning(f"Bootstrap personal_info: {e}")
-    return _get_default_personal_info().model_dump()
+        return Fallback(defaults.data("personal_info"))
+    return defaults.data("personal_info")
 
 
 async def _fetch_stats():
     try:
-        rows = await db.stats.find({}, {"_id": 0}).sort("order", 1).to_list(100)
+        rows = await content_read_db("stats").stats.find({}, lean_projection(Stat)).sort("order", 1).to_list(100)
         if rows:
-            return [r for r in rows]
+            return rows
     except Exception as e:
         logger.warning(f"Bootstrap stats: {e}")
-    return [s.model_dump() for s in _get_default_stats()]
+        return Fallback(defaults.data("stats"))
+    return defaults.data("stats")
 
 
 async def _fetch_nav_links():
     try:
-        rows = await db.nav_links.find({}, {"_id": 0}).sort("order", 1).to_list(100)
+        rows = await content_read_db("nav_links").nav_links.find({}, lean_projection(NavLink)).sort("order", 1).to_list(100)
         if rows:
             return rows
     except Exception as e:
         logger.warning(f"Bootstrap nav_links: {e}")
-    return _DEFAULT_NAV_LINKS
+        return Fallback(defaults.data("nav_links"))
+    return defaults.data("nav_links")
 
 
 async def _fetch_services():
     try:
-        rows = await db.services.find({}, {"_id": 0}).to_list(100)
+        rows = await content_read_db("services").services.find({}, lean_projection(Service)).to_list(100)
         if rows:
             return rows
     except Exception as e:
         logger.warning(f"Bootstrap services: {e}")
-    return [s.model_dump() for s in _get_default_services()]
+        return Fallback(defaults.data("services"))
+    return defaults.data("services")
 
 
 async def _fetch_projects():
     try:
-        rows = await db.projects.find({}, {"_id": 0}).to_list(100)
+        rows = await content_read_db("projects").projects.find({}, lean_projection(Project)).to_list(100)
         if rows:
             return rows
     except Exception as e:
         logger.warning(f"Bootstrap projects: {e}")
-    return [p.model_dump() for p in _get_default_projects()]
+        return Fallback(defaults.data("projects"))
+    return defaults.data("projects")
 
 
 async def _fetch_products():
     try:
-        rows = await db.products.find({}, {"_id": 0}).to_list(100)
+        rows = await content_read_db("products").products.find({}, lean_projection(Product)).to_list(100)
         if rows:
             return rows
     except Exception as e:
         logger.warning(f"Bootstrap products: {e}")
-    return [p.model_dump() for p in _get_default_products()]
+        return Fallback(defaults.data("products"))
+    return defaults.data("products")
 
 
 async def _fetch_testimonials():
     try:
-        rows = await db.testimonials.find({}, {"_id": 0}).to_list(100)
+        rows = await content_read_db("testimonials").testimonials.find({}, lean_projection(Testimonial)).to_list(100)
         if rows:
             return rows
     except Exception as e:
         logger.warning(f"Bootstrap testimonials: {e}")
-    return [t.model_dump() for t in _get_default_testimonials()]
+        return Fallback(defaults.data("testimonials"))
+    return defaults.data("testimonials")
 
 
 async def _fetch_skills():
     try:
-        rows = await db.skills.find({}, {"_id": 0}).to_list(100)
+        rows = await content_read_db("skills").skills.find({}, lean_projection(Skill)).to_list(100)
         if rows:
             return rows
     except Exception as e:
         logger.warning(f"Bootstrap skills: {e}")
-    return [s.model_dump() for s in _get_default_skills()]
+        return Fallback(defaults.data("skills"))
+    return defaults.data("skills")
+
+
+# Response key -> (source collection, fetcher), in response order
+_SECTIONS = {
+    "personalInfo": ("personal_info", _fetch_personal_info),
+    "stats": ("stats", _fetch_stats),
+    "navLinks": ("nav_links", _fetch_nav_links),
+    "services": ("services", _fetch_services),
+    "projects": ("projects", _fetch_projects),
+    "products": ("products", _fetch_products),
+    "testimonials": ("testimonials", _fetch_testimonials),
+    "skills": ("skills", _fetch_skills),
+}
+ALL_SECTIONS = tuple(_SECTIONS)
+
+
+def _parse_sections(sections: Optional[str]) -> Tuple[str, ...]:
+    """Turn ?sections=a,b into a canonical, de-duplicated tuple of section names."""
+    if not sections:
+        return ALL_SECTIONS
+    requested = {name.strip() for name in sections.split(",") if name.strip()}
+    unknown = requested - set(_SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown bootstrap section(s): {sorted(unknown)}. Must be among: {list(ALL_SECTIONS)}",
+        )
+    if not requested:
+        return ALL_SECTIONS
+    return tuple(name for name in ALL_SECTIONS if name in requested)
+
+
+# Per-section stages mirroring the queries in the _fetch_* helpers
+_SECTION_PIPELINES = {
+    "personalInfo": [{"$limit": 1}, {"$project": lean_projection(PersonalInfo)}],
+    "stats": [{"$sort": {"order": 1}}, {"$limit": 100}, {"$project": lean_projection(Stat)}],
+    "navLinks": [{"$sort": {"order": 1}}, {"$limit": 100}, {"$project": lean_projection(NavLink)}],
+    "services": [{"$limit": 100}, {"$project": lean_projection(Service)}],
+    "projects": [{"$limit": 100}, {"$project": lean_projection(Project)}],
+    "products": [{"$limit": 100}, {"$project": lean_projection(Product)}],
+    "testimonials": [{"$limit": 100}, {"$project": lean_projection(Testimonial)}],
+    "skills": [{"$limit": 100}, {"$project": lean_projection(Skill)}],
+}
+
+
+def _bootstrap_pipeline(sections: Tuple[str, ...]) -> list:
+    """One pipeline over the first section's collection, $unionWith the rest, rows tagged by section."""
+    first, *rest = sections
+    pipeline = [*_SECTION_PIPELINES[first], {"$addFields": {"_section": first}}]
+    for name in rest:
+        pipeline.append({
+            "$unionWith": {
+                "coll": _SECTIONS[name][0],
+                "pipeline": [*_SECTION_PIPELINES[name], {"$addFields": {"_section": name}}],
+            }
+        })
+    return pipeline
+
+
+async def _gather_sections(sections: Tuple[str, ...]) -> list:
+    """Fetch every requested section with its own query, concurrently."""
+    return await asyncio.gather(*(_SECTIONS[name][1]() for name in sections))
+
+
+async def _aggregate_sections(sections: Tuple[str, ...]) -> list:
+    """Fetch every requested section with a single aggregate command (MongoDB 4.4+).
+
+    If the aggregate fails, the per-section queries are tried instead, so one
+    error costs neither every section nor a cached payload of defaults.
+    """
+    grouped = {name: [] for name in sections}
+    try:
+        collections = [_SECTIONS[name][0] for name in sections]
+        collection = content_read_db(*collections)[collections[0]]
+        # A batch large enough for every section keeps this to one round trip (no getMore)
+        cursor = collection.aggregate(_bootstrap_pipeline(sections), batchSize=1000)
+        for row in await cursor.to_list(None):
+            grouped[row.pop("_section")].append(row)
+    except Exception as e:
+        logger.warning(f"Bootstrap aggregate failed, fetching sections one by one: {e}")
+        return await _gather_sections(sections)
+    results = []
+    for name in sections:
+        rows = grouped[name]
+        if not rows:
+            results.append(defaults.data(_SECTIONS[name][0]))
+        elif name == "personalInfo":
+            results.append(rows[0])
+        else:
+            results.append(rows)
+    return results
+
+
+async def _build_bootstrap(sections: Tuple[str, ...]):
+    static = content_cache.pinned("bootstrap")
+    if static is not None:
+        # Static snapshot mode: cut the subset from the exported payload, no DB access
+        payload = json.loads(static.body)
+        return encode_snapshot({name: payload[name] for name in sections})
+    if settings.BOOTSTRAP_FETCH_MODE == "aggregate":
+        results = await _aggregate_sections(sections)
+    else:
+        results = await _gather_sections(sections)
+    if any(isinstance(result, Fallback) for result in results):
+        # Some section is placeholder content: serve it uncached (and uncompressed, as it is built per request)
+        payload = {name: result.value if isinstance(result, Fallback) else result for name, result in zip(sections, results)}
+        return Fallback(encode_snapshot(payload, compress=False))
+    return encode_snapshot(dict(zip(sections, results)))
 
 
 @router.get("")
-async def get_bootstrap(response: Response):
-    """Return all home-page data in one request. One round-trip, one DB wait."""
-    response.headers["Cache-Control"] = "public, max-age=60"
-    personal_info, stats, nav_links, services, projects, products, testimonials, skills = await asyncio.gather(
-        _fetch_personal_info(),
-        _fetch_stats(),
-        _fetch_nav_links(),
-        _fetch_services(),
-        _fetch_projects(),
-        _fetch_products(),
-        _fetch_testimonials(),
-        _fetch_skills(),
+async def get_bootstrap(request: Request, sections: Optional[str] = None):
+    """Return home-page data in one request. Served from the in-process snapshot when warm.
+
+    ``sections`` is an optional comma-separated subset (e.g. ``products,navLinks``);
+    only those collections are fetched and each subset is cached on its own.
+    """
+    names = _parse_sections(sections)
+    key = "bootstrap" if names == ALL_SECTIONS else "bootstrap:" + ",".join(names)
+    snapshot = await content_cache.get_or_build(
+        key,
+        lambda: _build_bootstrap(names),
+        [_SECTIONS[name][0] for name in names],
     )
-    return {
-        "personalInfo": personal_info,
-        "stats": stats,
-        "navLinks": nav_links,
-        "services": services,
-        "projects": projects,
-        "products": products,
-        "testimonials": testimonials,
-        "skills": skills,
-    }
+    return snapshot_response(request, snapshot)
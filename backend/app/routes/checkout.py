@@ -1,11 +1,16 @@
 """Checkout and payment routes"""
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from app.core.database import db
 from app.core.config import settings
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, InvalidCursor, fetch_page
 from app.models.orders import Order, OrderCreate, CheckoutSessionRequest, CheckoutSessionResponse, PaymentStats, RazorpayVerifyRequest
+from app.services.order_events import order_events
+from app.services.order_search_service import OrderSearchService
+from app.services.order_stats_service import OrderStatsService, TRANSITION_PROJECTION
 from app.services.payment_service import PaymentService
+from pymongo import ReturnDocument
 from bson import ObjectId
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 import logging
 import stripe
@@ -43,7 +48,11 @@ async def create_checkout_session(request: CheckoutSessionRequest):
                 customerPhone=request.customerPhone,
                 shippingAddress=request.shippingAddress
             )
-            await db.orders.insert_one(order.dict())
+            order_doc = order.dict()
+            order_doc.update(OrderSearchService.search_fields(order_doc))
+            await db.orders.insert_one(order_doc)
+            await OrderStatsService.record_created(order_doc)
+            order_events.order_created(order_doc)
         except Exception as db_error:
             logger.warning(f"Could not save order to database: {db_error}")
             # Continue even if database save fails
@@ -74,7 +83,7 @@ async def verify_razorpay_payment(body: RazorpayVerifyRequest):
         client.utility.verify_payment_signature(params)
         # Update order status
         try:
-            await db.orders.update_one(
+            before = await db.orders.find_one_and_update(
                 {"paymentSessionId": body.razorpay_order_id},
                 {
                     "$set": {
@@ -83,7 +92,11 @@ async def verify_razorpay_payment(body: RazorpayVerifyRequest):
                         "updatedAt": datetime.now(timezone.utc),
                     }
                 },
+                projection=TRANSITION_PROJECTION,
+                return_document=ReturnDocument.BEFORE,
             )
+            await OrderStatsService.record_transition(before, "paid")
+            order_events.status_changed(before, "paid")
         except Exception as db_error:
             logger.warning(f"Could not update order in database: {db_error}")
         return {"status": "success", "message": "Payment verified"}
@@ -124,7 +137,7 @@ async def stripe_webhook(request: Request):
             # Update order status in database
             try:
                 from datetime import datetime, timezone
-                await db.orders.update_one(
+                before = await db.orders.find_one_and_update(
                     {"paymentSessionId": session["id"]},
                     {
                         "$set": {
@@ -132,8 +145,12 @@ async def stripe_webhook(request: Request):
                             "paymentIntentId": session.get("payment_intent"),
                             "updatedAt": datetime.now(timezone.utc)
                         }
-                    }
+                    },
+                    projection=TRANSITION_PROJECTION,
+                    return_document=ReturnDocument.BEFORE,
                 )
+                await OrderStatsService.record_transition(before, "paid")
+                order_events.status_changed(before, "paid")
                 logger.info(f"Order {session['id']} marked as paid")
             except Exception as db_error:
                 logger.error(f"Error updating order status: {db_error}")
@@ -146,22 +163,30 @@ async def stripe_webhook(request: Request):
 
 
 @router.get("/orders", response_model=List[Order])
-async def get_orders(session_id: str = "default", limit: int = 50):
-    """Get orders (for admin or user)"""
+async def get_orders(
+    response: Response,
+    session_id: str = "default",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """Get orders (for admin or user), newest first; page with the X-Next-Cursor header"""
     try:
-        cursor = db.orders.find().sort("createdAt", -1).limit(limit)
+        docs, next_cursor = await fetch_page(db.orders, {}, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         orders = []
-        async for doc in cursor:
+        for doc in docs:
             # Convert ObjectId to string
             if "_id" in doc:
                 doc["id"] = str(doc["_id"])
                 del doc["_id"]
             orders.append(Order(**doc))
         return orders
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting orders: {e}")
-        # Return empty list if database is not available
-        return []
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/orders/{order_id}", response_model=Order)
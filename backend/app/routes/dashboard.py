@@ -1,51 +1,92 @@
 """Dashboard routes for payment and order management (admin only)"""
-from fastapi import APIRouter, HTTPException, Depends
-from app.core.database import db
-from app.core.auth import get_current_admin
-from app.models.orders import Order, PaymentStats
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.database import db, get_pool_stats
+from app.core.monitoring import command_metrics
+from app.core.pagination import DEFAULT_PAGE_SIZE, KEYSET_SORT, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, InvalidCursor, fetch_page
+from app.core.query_profiler import query_profiler
+from app.core.auth import STREAM_TOKEN_EXPIRE_SECONDS, create_stream_token, get_current_admin, get_stream_admin
+from app.models.orders import (
+    ORDER_STATUSES,
+    BulkStatusRequest,
+    BulkStatusResponse,
+    BulkStatusResult,
+    Order,
+    PaymentStats,
+    ProductPerformance,
+    ProductPerformanceReport,
+    RevenueSeries,
+)
+from app.services.order_events import order_events
+from app.services.order_search_service import OrderSearchService
+from app.services.order_stats_service import OrderStatsService, SERIES_FORMATS, TRANSITION_PROJECTION
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import ConnectionFailure
 from bson import ObjectId
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timezone, timedelta
+import asyncio
+import csv
+import io
+import json
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Dashboard"])
 
+# Largest batch accepted by the bulk status endpoint
+BULK_STATUS_MAX_ITEMS = 5000
+# Seconds between SSE comment lines that keep idle proxies from closing the order stream
+STREAM_KEEPALIVE_SECONDS = 15
+
+
+def _payment_stats_pipeline(today: datetime) -> list:
+    """One pass over orders: counts and revenue per status, plus today's orders and paid revenue"""
+    # Orders written without a status are pending, as the Order model defaults them
+    status = {"$ifNull": ["$status", "pending"]}
+    return [
+        {"$project": {"_id": 0, "status": status, "total": 1, "createdAt": 1}},
+        {"$facet": {
+            "byStatus": [
+                {"$group": {"_id": "$status", "count": {"$sum": 1}, "revenue": {"$sum": "$total"}}},
+            ],
+            "today": [
+                {"$match": {"createdAt": {"$gte": today}}},
+                {"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "revenue": {"$sum": {"$cond": [{"$eq": ["$status", "paid"]}, "$total", 0]}},
+                }},
+            ],
+        }},
+    ]
+
 
 @router.get("/dashboard/stats", response_model=PaymentStats)
 async def get_payment_stats(_: dict = Depends(get_current_admin)):
     """Get payment and order statistics"""
     try:
-        # Get all orders
-        cursor = db.orders.find()
-        orders = []
-        async for doc in cursor:
-            if "_id" in doc:
-                doc["id"] = str(doc["_id"])
-                del doc["_id"]
-            orders.append(Order(**doc))
-        
-        # Calculate stats
-        total_orders = len(orders)
-        total_revenue = sum(order.total for order in orders if order.status == "paid")
-        pending_orders = len([o for o in orders if o.status == "pending"])
-        paid_orders = len([o for o in orders if o.status == "paid"])
-        failed_orders = len([o for o in orders if o.status == "failed"])
-        
-        # Today's stats
         today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        today_orders = [o for o in orders if o.createdAt >= today]
-        today_revenue = sum(order.total for order in today_orders if order.status == "paid")
-        today_orders_count = len(today_orders)
+        stats = await OrderStatsService.get_payment_stats(today)
+        if stats is not None:
+            return stats
+        
+        # No counter baseline yet (run rebuild_order_stats.py once): aggregate over orders
+        rows = await db.orders.aggregate(_payment_stats_pipeline(today)).to_list(1)
+        result = rows[0] if rows else {"byStatus": [], "today": []}
+        by_status = {row["_id"]: row for row in result["byStatus"]}
+        today_stats = result["today"][0] if result["today"] else {"count": 0, "revenue": 0}
         
         return PaymentStats(
-            totalOrders=total_orders,
-            totalRevenue=total_revenue,
-            pendingOrders=pending_orders,
-            paidOrders=paid_orders,
-            failedOrders=failed_orders,
-            todayRevenue=today_revenue,
-            todayOrders=today_orders_count
+            totalOrders=sum(row["count"] for row in by_status.values()),
+            totalRevenue=by_status.get("paid", {}).get("revenue", 0),
+            pendingOrders=by_status.get("pending", {}).get("count", 0),
+            paidOrders=by_status.get("paid", {}).get("count", 0),
+            failedOrders=by_status.get("failed", {}).get("count", 0),
+            todayRevenue=today_stats["revenue"],
+            todayOrders=today_stats["count"]
         )
     except Exception as e:
         logger.error(f"Error getting payment stats: {e}")
@@ -61,25 +102,324 @@ async def get_payment_stats(_: dict = Depends(get_current_admin)):
         )
 
 
+# Default look-back per granularity, and a cap on points per response
+_REVENUE_DEFAULT_RANGE = {"hour": timedelta(hours=48), "day": timedelta(days=30), "month": timedelta(days=365)}
+_REVENUE_MAX_POINTS = 2000
+
+
+@router.get("/dashboard/revenue", response_model=RevenueSeries)
+async def get_revenue_series(
+    granularity: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    _: dict = Depends(get_current_admin),
+):
+    """Order count and paid revenue per hour, day or month (UTC, by order creation time).
+    
+    Served from the hourly rollups, or from the orders themselves until rebuild_order_stats.py has run.
+    """
+    if granularity not in SERIES_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid granularity. Must be one of: {list(SERIES_FORMATS)}")
+    end = end or datetime.now(timezone.utc)
+    start = start or end - _REVENUE_DEFAULT_RANGE[granularity]
+    # Naive query parameters are taken as UTC
+    end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+    start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if granularity == "hour" and (end - start) > timedelta(hours=_REVENUE_MAX_POINTS):
+        raise HTTPException(status_code=400, detail=f"Hourly series are limited to {_REVENUE_MAX_POINTS} points")
+    if granularity == "day" and (end - start) > timedelta(days=_REVENUE_MAX_POINTS):
+        raise HTTPException(status_code=400, detail=f"Daily series are limited to {_REVENUE_MAX_POINTS} points")
+    months = (end.year - start.year) * 12 + end.month - start.month
+    if granularity == "month" and months > _REVENUE_MAX_POINTS:
+        raise HTTPException(status_code=400, detail=f"Monthly series are limited to {_REVENUE_MAX_POINTS} points")
+    try:
+        points = await OrderStatsService.revenue_series(granularity, start, end)
+    except Exception as e:
+        logger.error(f"Error getting revenue series: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return RevenueSeries(granularity=granularity, start=start, end=end, points=points)
+
+
+# Product performance: sort keys, default look-back, cap on products per response
+PRODUCT_PERFORMANCE_SORTS = ["revenue", "units", "orders", "conversion"]
+_PRODUCT_PERFORMANCE_DEFAULT_RANGE = timedelta(days=30)
+_PRODUCT_PERFORMANCE_MAX_LIMIT = 500
+
+
+@router.get("/dashboard/products/performance", response_model=ProductPerformanceReport)
+async def get_product_performance(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    sort: str = "revenue",
+    limit: int = Query(50, ge=1, le=_PRODUCT_PERFORMANCE_MAX_LIMIT),
+    _: dict = Depends(get_current_admin),
+):
+    """Units sold, paid revenue and order-to-paid conversion per product, top sellers first.
+    
+    Served from the product_sales counters, which cover whole UTC days (start and
+    end are widened to day boundaries); until rebuild_order_stats.py has run, the
+    exact range is aggregated over orders instead.
+    """
+    if sort not in PRODUCT_PERFORMANCE_SORTS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Must be one of: {PRODUCT_PERFORMANCE_SORTS}")
+    end = end or datetime.now(timezone.utc)
+    start = start or end - _PRODUCT_PERFORMANCE_DEFAULT_RANGE
+    # Naive query parameters are taken as UTC
+    end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+    start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    try:
+        rows = await OrderStatsService.product_performance(start, end)
+        if rows is None:
+            rows = await OrderStatsService.product_performance_live(start, end)
+        else:
+            start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+            last_day = (end - timedelta(microseconds=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            end = last_day + timedelta(days=1)
+    except Exception as e:
+        logger.error(f"Error getting product performance: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    products = [
+        ProductPerformance(
+            productId=str(row["_id"]),
+            name=row.get("name"),
+            orders=row["orders"],
+            paidOrders=row["paidOrders"],
+            units=row["units"],
+            revenue=row["revenue"],
+            conversion=round(row["paidOrders"] / row["orders"], 4) if row["orders"] else 0.0,
+        )
+        for row in rows
+        if row["orders"] or row["paidOrders"]
+    ]
+    products.sort(key=lambda product: (getattr(product, sort), product.revenue), reverse=True)
+    return ProductPerformanceReport(start=start, end=end, sort=sort, products=products[:limit])
+
+
+def _orders_query(status: Optional[str], start: Optional[datetime], end: Optional[datetime]) -> dict:
+    """Dashboard order filter: optional status and createdAt range [start, end)"""
+    query = {}
+    if status:
+        query["status"] = status
+    if start or end:
+        query["createdAt"] = {}
+        if start:
+            query["createdAt"]["$gte"] = start
+        if end:
+            query["createdAt"]["$lt"] = end
+    return query
+
+
 @router.get("/dashboard/orders", response_model=List[Order])
-async def get_dashboard_orders(limit: int = 50, status: str = None, _: dict = Depends(get_current_admin)):
-    """Get orders for dashboard with optional status filter"""
+async def get_dashboard_orders(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: str = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    _: dict = Depends(get_current_admin),
+):
+    """Get orders for dashboard with optional status and date filters, newest first.
+    
+    Pass the X-Next-Cursor response header back as ``cursor`` to get the next page.
+    """
     try:
-        query = {}
-        if status:
-            query["status"] = status
+        query = _orders_query(status, start, end)
         
-        cursor = db.orders.find(query).sort("createdAt", -1).limit(limit)
+        docs, next_cursor = await fetch_page(db.orders, query, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         orders = []
-        async for doc in cursor:
+        for doc in docs:
             if "_id" in doc:
                 doc["id"] = str(doc["_id"])
                 del doc["_id"]
             orders.append(Order(**doc))
         return orders
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting dashboard orders: {e}")
-        return []
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/dashboard/orders/search", response_model=List[Order])
+async def search_orders(
+    response: Response,
+    email: Optional[str] = None,
+    name: Optional[str] = None,
+    payment_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    _: dict = Depends(get_current_admin),
+):
+    """Find orders by customer email prefix, customer name words and/or gateway session or payment ID.
+    
+    Newest first; page with the X-Next-Cursor header like /dashboard/orders.
+    """
+    try:
+        query = OrderSearchService.build_query(email=email, name=name, payment_id=payment_id)
+        docs, next_cursor = await fetch_page(db.orders, query, limit, cursor)
+    except ValueError as e:  # includes InvalidCursor
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching orders: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    orders = []
+    for doc in docs:
+        doc["id"] = str(doc.pop("_id"))
+        orders.append(Order(**doc))
+    return orders
+
+
+# Documents fetched per getMore while exporting, and rows per chunk written to the client
+_EXPORT_BATCH_SIZE = 1000
+_EXPORT_CHUNK_ROWS = 500
+_EXPORT_CSV_FIELDS = [
+    "id", "createdAt", "updatedAt", "status", "total", "paymentMethod", "paymentSessionId",
+    "paymentIntentId", "customerEmail", "customerName", "customerPhone", "items",
+]
+
+
+# Only the exported columns are read, so internal fields (e.g. customerEmailLower) never leak
+_EXPORT_PROJECTION = {field: 1 for field in _EXPORT_CSV_FIELDS if field != "id"}
+# Leading characters that make spreadsheet apps evaluate a cell as a formula
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        # MongoDB hands back naive UTC datetimes; make the offset explicit
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _export_csv(docs: List[dict], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(_EXPORT_CSV_FIELDS)
+    for doc in docs:
+        row = {**doc, "items": json.dumps(doc.get("items", []), default=_export_value)}
+        writer.writerow([_csv_cell(_export_value(row.get(field, ""))) for field in _EXPORT_CSV_FIELDS])
+    return buffer.getvalue()
+
+
+def _export_ndjson(docs: List[dict]) -> str:
+    return "".join(json.dumps(doc, default=_export_value) + "\n" for doc in docs)
+
+
+def _export_doc(doc: dict) -> dict:
+    if "_id" in doc:
+        doc["id"] = str(doc.pop("_id"))
+    return doc
+
+
+async def _export_chunks(first: Optional[dict], cursor, format: str):
+    """Encode orders as they arrive from the cursor; memory stays bounded by one batch"""
+    if format == "csv":
+        yield _export_csv([], header=True)
+    pending = [_export_doc(first)] if first else []
+    try:
+        async for doc in cursor:
+            pending.append(_export_doc(doc))
+            if len(pending) >= _EXPORT_CHUNK_ROWS:
+                yield _export_csv(pending, header=False) if format == "csv" else _export_ndjson(pending)
+                pending = []
+        if pending:
+            yield _export_csv(pending, header=False) if format == "csv" else _export_ndjson(pending)
+    except Exception as e:
+        # Headers are already sent; the truncated body is all we can signal
+        logger.error(f"Order export aborted: {e}")
+        raise
+    finally:
+        # Also runs when the client disconnects mid-export, so the server cursor is not left open
+        await cursor.close()
+
+
+@router.get("/dashboard/orders/export")
+async def export_orders(
+    format: str = "csv",
+    status: str = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    _: dict = Depends(get_current_admin),
+):
+    """Stream matching orders (newest first) as CSV or NDJSON"""
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="Invalid format. Must be one of: ['csv', 'ndjson']")
+    cursor = None
+    try:
+        cursor = (
+            db.orders.find(_orders_query(status, start, end), _EXPORT_PROJECTION)
+            .sort(KEYSET_SORT)
+            .batch_size(_EXPORT_BATCH_SIZE)
+        )
+        # Read the first document up front so a database error still gets a proper status code
+        first = await anext(cursor, None)
+    except Exception as e:
+        logger.error(f"Error exporting orders: {e}")
+        if cursor is not None:
+            await cursor.close()
+        if isinstance(e, ConnectionFailure):
+            raise HTTPException(status_code=503, detail="Database unavailable")
+        raise HTTPException(status_code=500, detail=str(e))
+    filename = f"orders-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        _export_chunks(first, cursor, format),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _order_event_stream():
+    """Server-sent events for one subscriber, with keepalive comments while idle"""
+    with order_events.subscribe() as queue:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@router.post("/dashboard/orders/stream-token")
+async def create_order_stream_token(admin: dict = Depends(get_current_admin)):
+    """Short-lived token for opening /dashboard/orders/stream from an EventSource"""
+    return {"token": create_stream_token(admin["sub"]), "expiresIn": STREAM_TOKEN_EXPIRE_SECONDS}
+
+
+@router.get("/dashboard/orders/stream")
+async def stream_order_events(_: dict = Depends(get_stream_admin)):
+    """Live order.created / order.status_changed events as server-sent events.
+    
+    EventSource cannot send an Authorization header, so pass a token from
+    POST /dashboard/orders/stream-token as ?token= instead. It is only checked
+    when connecting; after a dropped connection, fetch a new one to reconnect.
+    """
+    return StreamingResponse(
+        _order_event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/dashboard/orders/{order_id}", response_model=Order)
@@ -114,37 +454,151 @@ async def update_order_status(order_id: str, status: str, _: dict = Depends(get_
     """Update order status"""
     try:
         from bson import ObjectId
-        valid_statuses = ["pending", "paid", "failed", "cancelled", "refunded"]
-        if status not in valid_statuses:
-            raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
+        if status not in ORDER_STATUSES:
+            raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {ORDER_STATUSES}")
         
         try:
-            result = await db.orders.update_one(
+            before = await db.orders.find_one_and_update(
                 {"_id": ObjectId(order_id)},
                 {
                     "$set": {
                         "status": status,
                         "updatedAt": datetime.now(timezone.utc)
                     }
-                }
+                },
+                projection=TRANSITION_PROJECTION,
+                return_document=ReturnDocument.BEFORE,
             )
         except:
-            result = await db.orders.update_one(
+            before = await db.orders.find_one_and_update(
                 {"paymentSessionId": order_id},
                 {
                     "$set": {
                         "status": status,
                         "updatedAt": datetime.now(timezone.utc)
                     }
-                }
+                },
+                projection=TRANSITION_PROJECTION,
+                return_document=ReturnDocument.BEFORE,
             )
         
-        if result.matched_count == 0:
+        if before is None:
             raise HTTPException(status_code=404, detail="Order not found")
         
+        await OrderStatsService.record_transition(before, status)
+        order_events.status_changed(before, status)
         return {"message": "Order status updated successfully", "status": status}
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error updating order status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/dashboard/orders/bulk-status", response_model=BulkStatusResponse)
+async def bulk_update_order_status(body: BulkStatusRequest, _: dict = Depends(get_current_admin)):
+    """Set the status of many orders at once, with a result per item.
+    
+    IDs are resolved in one query (order _id, else paymentSessionId) and all
+    changes are written with one bulk_write. Each write only applies while the
+    order still has the status read here; an order changed concurrently is
+    reported as ``conflict`` and left to the other writer.
+    """
+    if len(body.updates) > BULK_STATUS_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_STATUS_MAX_ITEMS} updates per request")
+    object_ids = [ObjectId(item.id) for item in body.updates if ObjectId.is_valid(item.id)]
+    session_ids = [item.id for item in body.updates]
+    try:
+        cursor = db.orders.find(
+            {"$or": [{"_id": {"$in": object_ids}}, {"paymentSessionId": {"$in": session_ids}}]},
+            TRANSITION_PROJECTION,
+        )
+        by_id = {}
+        by_session = {}
+        async for doc in cursor:
+            by_id[str(doc["_id"])] = doc
+            if doc.get("paymentSessionId"):
+                by_session.setdefault(doc["paymentSessionId"], doc)
+        
+        results = []
+        writes = []
+        transitions = []
+        seen = set()
+        now = datetime.now(timezone.utc)
+        # Tags this request's writes so the ones that landed can be found again,
+        # even if a later write has already moved updatedAt on
+        bulk_op_id = uuid.uuid4().hex
+        for item in body.updates:
+            if item.status not in ORDER_STATUSES:
+                results.append(BulkStatusResult(id=item.id, result="invalid_status"))
+                continue
+            doc = by_id.get(item.id) or by_session.get(item.id)
+            if doc is None:
+                results.append(BulkStatusResult(id=item.id, result="not_found"))
+                continue
+            previous = doc.get("status") or "pending"
+            if doc["_id"] in seen:
+                results.append(BulkStatusResult(id=item.id, result="duplicate", previousStatus=previous))
+                continue
+            seen.add(doc["_id"])
+            if previous == item.status:
+                results.append(BulkStatusResult(id=item.id, result="unchanged", previousStatus=previous, status=previous))
+                continue
+            # Only applies if nobody changed the status since it was read above
+            writes.append(UpdateOne(
+                {"_id": doc["_id"], "status": doc.get("status")},
+                {"$set": {"status": item.status, "updatedAt": now, "bulkOpId": bulk_op_id}},
+            ))
+            transitions.append((doc, item.status))
+            results.append(BulkStatusResult(id=item.id, result="updated", previousStatus=previous, status=item.status))
+        
+        updated = 0
+        if writes:
+            write_result = await db.orders.bulk_write(writes, ordered=False)
+            applied = transitions
+            if write_result.matched_count < len(writes):
+                # Some orders changed status concurrently: count only the writes that landed
+                landed = {
+                    doc["_id"]
+                    async for doc in db.orders.find(
+                        {"_id": {"$in": [doc["_id"] for doc, _ in transitions]}, "bulkOpId": bulk_op_id},
+                        {"_id": 1},
+                    )
+                }
+                applied = [(doc, new_status) for doc, new_status in transitions if doc["_id"] in landed]
+                for result in results:
+                    doc = by_id.get(result.id) or by_session.get(result.id)
+                    if result.result == "updated" and doc["_id"] not in landed:
+                        result.result, result.status = "conflict", None
+            updated = len(applied)
+            await OrderStatsService.record_transitions(applied)
+            for doc, new_status in applied:
+                order_events.status_changed(doc, new_status)
+        return BulkStatusResponse(updated=updated, results=results)
+    except Exception as e:
+        logger.error(f"Error bulk updating order status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/dashboard/db/pool")
+async def get_db_pool_stats(_: dict = Depends(get_current_admin)):
+    """MongoDB connection pool counters for this worker"""
+    return get_pool_stats()
+
+
+@router.get("/dashboard/db/queries")
+async def get_db_query_stats(reset: bool = False, _: dict = Depends(get_current_admin)):
+    """Per-route MongoDB query counts and timings for this worker"""
+    routes = command_metrics.snapshot()
+    if reset:
+        command_metrics.reset()
+    return routes
+
+
+@router.get("/dashboard/db/slow-queries")
+async def get_db_slow_queries(reset: bool = False, _: dict = Depends(get_current_admin)):
+    """Slow MongoDB commands and flagged query plans (requires MONGO_QUERY_PROFILING)"""
+    report = {"enabled": settings.MONGO_QUERY_PROFILING, **query_profiler.snapshot()}
+    if reset:
+        query_profiler.reset()
+    return report
@@ -1,31 +1,46 @@
 """Navigation links routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 from app.models.nav_links import NavLink, NavLinkCreate
-from app.core.database import db
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.database import content_read_db, db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
 from app.core.logging_config import setup_logging
 
 logger = setup_logging()
 router = APIRouter(prefix="/nav-links", tags=["nav-links"])
 
 
-@router.get("", response_model=List[NavLink])
-async def get_nav_links():
-    """Get all navigation links"""
+def _get_default_nav_links():
+    """Get default navigation links"""
+    return [
+        NavLink(id="1", label="Home", href="#home", order=0),
+        NavLink(id="2", label="Services", href="#services", order=1),
+        NavLink(id="3", label="Portfolio", href="#portfolio", order=2),
+        NavLink(id="4", label="Products", href="#products", order=3),
+        NavLink(id="5", label="Testimonials", href="#testimonials", order=4),
+        NavLink(id="6", label="Contact", href="#contact", order=5),
+    ]
+
+
+defaults.register("nav_links", _get_default_nav_links)
+
+
+async def _load_nav_links():
     try:
-        nav_links = await db.nav_links.find({}, {"_id": 0}).sort("order", 1).to_list(100)
-        return [NavLink(**link) for link in nav_links] if nav_links else []
+        nav_links = await content_read_db("nav_links").nav_links.find({}, lean_projection(NavLink)).sort("order", 1).to_list(100)
+        return encode_snapshot(nav_links)
     except Exception as e:
         logger.warning(f"MongoDB query failed: {e}. Returning default nav links.")
-        # Return default nav links
-        return [
-            NavLink(id="1", label="Home", href="#home", order=0),
-            NavLink(id="2", label="Services", href="#services", order=1),
-            NavLink(id="3", label="Portfolio", href="#portfolio", order=2),
-            NavLink(id="4", label="Products", href="#products", order=3),
-            NavLink(id="5", label="Testimonials", href="#testimonials", order=4),
-            NavLink(id="6", label="Contact", href="#contact", order=5),
-        ]
+        return Fallback(defaults.snapshot("nav_links"))
+
+
+@router.get("", response_model=List[NavLink])
+async def get_nav_links(request: Request):
+    """Get all navigation links"""
+    snapshot = await content_cache.get_or_build("nav_links", _load_nav_links, ("nav_links",))
+    return snapshot_response(request, snapshot)
 
 
 @router.post("", response_model=NavLink)
@@ -35,6 +50,7 @@ async def create_nav_link(nav_link: NavLinkCreate):
         nav_link_obj = NavLink(**nav_link.model_dump())
         doc = nav_link_obj.model_dump()
         await db.nav_links.insert_one(doc)
+        content_cache.invalidate("nav_links")
         return nav_link_obj
     except Exception as e:
         logger.error(f"Error creating nav link: {e}")
@@ -48,6 +64,7 @@ async def delete_nav_link(nav_link_id: str):
         result = await db.nav_links.delete_one({"id": nav_link_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Nav link not found")
+        content_cache.invalidate("nav_links")
         return {"message": "Nav link deleted successfully"}
     except HTTPException:
         raise
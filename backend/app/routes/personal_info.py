@@ -1,7 +1,10 @@
 """Personal info routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from app.models.personal_info import PersonalInfo, PersonalInfoUpdate, Socials
-from app.core.database import db
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.database import content_read_db, db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
 from app.core.logging_config import setup_logging
 from datetime import datetime, timezone
 
@@ -9,17 +12,22 @@ logger = setup_logging()
 router = APIRouter(prefix="/personal-info", tags=["personal-info"])
 
 
-@router.get("", response_model=PersonalInfo)
-async def get_personal_info():
-    """Get personal information"""
+async def _load_personal_info():
     try:
-        info = await db.personal_info.find_one({}, {"_id": 0})
-        if not info:
-            return _get_default_personal_info()
-        return PersonalInfo(**info)
+        info = await content_read_db("personal_info").personal_info.find_one({}, lean_projection(PersonalInfo))
+        if info:
+            return encode_snapshot(info)
     except Exception as e:
         logger.warning(f"MongoDB query failed: {e}. Returning default personal info.")
-        return _get_default_personal_info()
+        return Fallback(defaults.snapshot("personal_info"))
+    return defaults.snapshot("personal_info")
+
+
+@router.get("", response_model=PersonalInfo)
+async def get_personal_info(request: Request):
+    """Get personal information"""
+    snapshot = await content_cache.get_or_build("personal_info", _load_personal_info, ("personal_info",))
+    return snapshot_response(request, snapshot)
 
 
 @router.put("", response_model=PersonalInfo)
@@ -43,6 +51,7 @@ async def update_personal_info(update: PersonalInfoUpdate):
             )
             doc = new_info.model_dump()
             await db.personal_info.insert_one(doc)
+            content_cache.invalidate("personal_info")
             return new_info
         
         update_dict = update.model_dump(exclude_unset=True)
@@ -50,6 +59,7 @@ async def update_personal_info(update: PersonalInfoUpdate):
             update_dict['socials'] = update_dict['socials'].model_dump() if hasattr(update_dict['socials'], 'model_dump') else update_dict['socials']
         
         await db.personal_info.update_one({}, {"$set": update_dict})
+        content_cache.invalidate("personal_info")
         updated = await db.personal_info.find_one({}, {"_id": 0})
         return PersonalInfo(**updated)
     except Exception as e:
@@ -77,3 +87,6 @@ def _get_default_personal_info():
             dribbble="https://dribbble.com"
         )
     )
+
+
+defaults.register("personal_info", _get_default_personal_info)
@@ -1,8 +1,11 @@
 """Products routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 from app.models.products import Product, ProductCreate
-from app.core.database import db
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.database import content_read_db, db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
 from app.core.logging_config import setup_logging
 
 logger = setup_logging()
@@ -19,15 +22,25 @@ def _get_default_products():
     ]
 
 
-@router.get("", response_model=List[Product])
-async def get_products():
-    """Get all products"""
+defaults.register("products", _get_default_products)
+
+
+async def _load_products():
     try:
-        products = await db.products.find({}, {"_id": 0}).to_list(100)
-        return [Product(**product) for product in products] if products else _get_default_products()
+        products = await content_read_db("products").products.find({}, lean_projection(Product)).to_list(100)
+        if products:
+            return encode_snapshot(products)
     except Exception as e:
         logger.warning(f"MongoDB query failed: {e}. Returning default products.")
-        return _get_default_products()
+        return Fallback(defaults.snapshot("products"))
+    return defaults.snapshot("products")
+
+
+@router.get("", response_model=List[Product])
+async def get_products(request: Request):
+    """Get all products"""
+    snapshot = await content_cache.get_or_build("products", _load_products, ("products",))
+    return snapshot_response(request, snapshot)
 
 
 @router.post("", response_model=Product)
@@ -37,6 +50,7 @@ async def create_product(product: ProductCreate):
         product_obj = Product(**product.model_dump())
         doc = product_obj.model_dump()
         await db.products.insert_one(doc)
+        content_cache.invalidate("products")
         return product_obj
     except Exception as e:
         logger.error(f"Error creating product: {e}")
@@ -50,6 +64,7 @@ async def delete_product(product_id: str):
         result = await db.products.delete_one({"id": product_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Product not found")
+        content_cache.invalidate("products")
         return {"message": "Product deleted successfully"}
     except HTTPException:
         raise
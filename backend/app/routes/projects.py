@@ -1,8 +1,11 @@
 """Projects routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 from app.models.projects import Project, ProjectCreate
-from app.core.database import db
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.database import content_read_db, db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
 from app.core.logging_config import setup_logging
 
 logger = setup_logging()
@@ -21,22 +24,32 @@ def _get_default_projects():
     ]
 
 
-@router.get("", response_model=List[Project])
-async def get_projects():
-    """Get all projects"""
+defaults.register("projects", _get_default_projects)
+
+
+async def _load_projects():
     try:
-        projects = await db.projects.find({}, {"_id": 0}).to_list(100)
-        return [Project(**project) for project in projects] if projects else _get_default_projects()
+        projects = await content_read_db("projects").projects.find({}, lean_projection(Project)).to_list(100)
+        if projects:
+            return encode_snapshot(projects)
     except Exception as e:
         logger.warning(f"MongoDB query failed: {e}. Returning default projects.")
-        return _get_default_projects()
+        return Fallback(defaults.snapshot("projects"))
+    return defaults.snapshot("projects")
+
+
+@router.get("", response_model=List[Project])
+async def get_projects(request: Request):
+    """Get all projects"""
+    snapshot = await content_cache.get_or_build("projects", _load_projects, ("projects",))
+    return snapshot_response(request, snapshot)
 
 
 @router.get("/{project_id}", response_model=Project)
 async def get_project(project_id: str):
     """Get a specific project"""
     try:
-        project = await db.projects.find_one({"id": project_id}, {"_id": 0})
+        project = await content_read_db("projects").projects.find_one({"id": project_id}, {"_id": 0})
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         return Project(**project)
@@ -54,6 +67,7 @@ async def create_project(project: ProjectCreate):
         project_obj = Project(**project.model_dump())
         doc = project_obj.model_dump()
         await db.projects.insert_one(doc)
+        content_cache.invalidate("projects")
         return project_obj
     except Exception as e:
         logger.error(f"Error creating project: {e}")
@@ -67,6 +81,7 @@ async def delete_project(project_id: str):
         result = await db.projects.delete_one({"id": project_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Project not found")
+        content_cache.invalidate("projects")
         return {"message": "Project deleted successfully"}
     except HTTPException:
         raise
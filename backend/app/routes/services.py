@@ -1,8 +1,11 @@
 """Services routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 from app.models.services import Service, ServiceCreate
-from app.core.database import db
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.database import content_read_db, db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
 from app.core.logging_config import setup_logging
 
 logger = setup_logging()
@@ -19,15 +22,25 @@ def _get_default_services():
     ]
 
 
-@router.get("", response_model=List[Service])
-async def get_services():
-    """Get all services"""
+defaults.register("services", _get_default_services)
+
+
+async def _load_services():
     try:
-        services = await db.services.find({}, {"_id": 0}).to_list(100)
-        return [Service(**service) for service in services] if services else _get_default_services()
+        services = await content_read_db("services").services.find({}, lean_projection(Service)).to_list(100)
+        if services:
+            return encode_snapshot(services)
     except Exception as e:
         logger.warning(f"MongoDB query failed: {e}. Returning default services.")
-        return _get_default_services()
+        return Fallback(defaults.snapshot("services"))
+    return defaults.snapshot("services")
+
+
+@router.get("", response_model=List[Service])
+async def get_services(request: Request):
+    """Get all services"""
+    snapshot = await content_cache.get_or_build("services", _load_services, ("services",))
+    return snapshot_response(request, snapshot)
 
 
 @router.post("", response_model=Service)
@@ -37,6 +50,7 @@ async def create_service(service: ServiceCreate):
         service_obj = Service(**service.model_dump())
         doc = service_obj.model_dump()
         await db.services.insert_one(doc)
+        content_cache.invalidate("services")
         return service_obj
     except Exception as e:
         logger.error(f"Error creating service: {e}")
@@ -50,6 +64,7 @@ async def delete_service(service_id: str):
         result = await db.services.delete_one({"id": service_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Service not found")
+        content_cache.invalidate("services")
         return {"message": "Service deleted successfully"}
     except HTTPException:
         raise
@@ -1,8 +1,11 @@
 """Skills routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 from app.models.skills import Skill, SkillCreate
-from app.core.database import db
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.database import content_read_db, db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
 from app.core.logging_config import setup_logging
 
 logger = setup_logging()
@@ -21,15 +24,25 @@ def _get_default_skills():
     ]
 
 
-@router.get("", response_model=List[Skill])
-async def get_skills():
-    """Get all skills"""
+defaults.register("skills", _get_default_skills)
+
+
+async def _load_skills():
     try:
-        skills = await db.skills.find({}, {"_id": 0}).to_list(100)
-        return [Skill(**skill) for skill in skills] if skills else _get_default_skills()
+        skills = await content_read_db("skills").skills.find({}, lean_projection(Skill)).to_list(100)
+        if skills:
+            return encode_snapshot(skills)
     except Exception as e:
         logger.warning(f"MongoDB query failed: {e}. Returning default skills.")
-        return _get_default_skills()
+        return Fallback(defaults.snapshot("skills"))
+    return defaults.snapshot("skills")
+
+
+@router.get("", response_model=List[Skill])
+async def get_skills(request: Request):
+    """Get all skills"""
+    snapshot = await content_cache.get_or_build("skills", _load_skills, ("skills",))
+    return snapshot_response(request, snapshot)
 
 
 @router.post("", response_model=Skill)
@@ -39,6 +52,7 @@ async def create_skill(skill: SkillCreate):
         skill_obj = Skill(**skill.model_dump())
         doc = skill_obj.model_dump()
         await db.skills.insert_one(doc)
+        content_cache.invalidate("skills")
         return skill_obj
     except Exception as e:
         logger.error(f"Error creating skill: {e}")
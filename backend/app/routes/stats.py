@@ -1,8 +1,11 @@
 """Stats routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 from app.models.stats import Stat, StatCreate
-from app.core.database import db
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.database import content_read_db, db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
 from app.core.logging_config import setup_logging
 
 logger = setup_logging()
@@ -19,15 +22,25 @@ def _get_default_stats():
     ]
 
 
-@router.get("", response_model=List[Stat])
-async def get_stats():
-    """Get all stats"""
+defaults.register("stats", _get_default_stats)
+
+
+async def _load_stats():
     try:
-        stats = await db.stats.find({}, {"_id": 0}).sort("order", 1).to_list(100)
-        return [Stat(**stat) for stat in stats] if stats else _get_default_stats()
+        stats = await content_read_db("stats").stats.find({}, lean_projection(Stat)).sort("order", 1).to_list(100)
+        if stats:
+            return encode_snapshot(stats)
     except Exception as e:
         logger.warning(f"MongoDB query failed: {e}. Returning default stats.")
-        return _get_default_stats()
+        return Fallback(defaults.snapshot("stats"))
+    return defaults.snapshot("stats")
+
+
+@router.get("", response_model=List[Stat])
+async def get_stats(request: Request):
+    """Get all stats"""
+    snapshot = await content_cache.get_or_build("stats", _load_stats, ("stats",))
+    return snapshot_response(request, snapshot)
 
 
 @router.post("", response_model=Stat)
@@ -37,6 +50,7 @@ async def create_stat(stat: StatCreate):
         stat_obj = Stat(**stat.model_dump())
         doc = stat_obj.model_dump()
         await db.stats.insert_one(doc)
+        content_cache.invalidate("stats")
         return stat_obj
     except Exception as e:
         logger.error(f"Error creating stat: {e}")
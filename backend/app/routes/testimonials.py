@@ -1,8 +1,11 @@
 """Testimonials routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List
 from app.models.testimonials import Testimonial, TestimonialCreate
-from app.core.database import db
+from app.core.cache import Fallback, content_cache, encode_snapshot
+from app.core.database import content_read_db, db, lean_projection
+from app.core.defaults import defaults
+from app.core.http_cache import snapshot_response
 from app.core.logging_config import setup_logging
 
 logger = setup_logging()
@@ -19,15 +22,25 @@ def _get_default_testimonials():
     ]
 
 
-@router.get("", response_model=List[Testimonial])
-async def get_testimonials():
-    """Get all testimonials"""
+defaults.register("testimonials", _get_default_testimonials)
+
+
+async def _load_testimonials():
     try:
-        testimonials = await db.testimonials.find({}, {"_id": 0}).to_list(100)
-        return [Testimonial(**testimonial) for testimonial in testimonials] if testimonials else _get_default_testimonials()
+        testimonials = await content_read_db("testimonials").testimonials.find({}, lean_projection(Testimonial)).to_list(100)
+        if testimonials:
+            return encode_snapshot(testimonials)
     except Exception as e:
         logger.warning(f"MongoDB query failed: {e}. Returning default testimonials.")
-        return _get_default_testimonials()
+        return Fallback(defaults.snapshot("testimonials"))
+    return defaults.snapshot("testimonials")
+
+
+@router.get("", response_model=List[Testimonial])
+async def get_testimonials(request: Request):
+    """Get all testimonials"""
+    snapshot = await content_cache.get_or_build("testimonials", _load_testimonials, ("testimonials",))
+    return snapshot_response(request, snapshot)
 
 
 @router.post("", response_model=Testimonial)
@@ -37,6 +50,7 @@ async def create_testimonial(testimonial: TestimonialCreate):
         testimonial_obj = Testimonial(**testimonial.model_dump())
         doc = testimonial_obj.model_dump()
         await db.testimonials.insert_one(doc)
+        content_cache.invalidate("testimonials")
         return testimonial_obj
     except Exception as e:
         logger.error(f"Error creating testimonial: {e}")
@@ -50,6 +64,7 @@ async def delete_testimonial(testimonial_id: str):
         result = await db.testimonials.delete_one({"id": testimonial_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Testimonial not found")
+        content_cache.invalidate("testimonials")
         return {"message": "Testimonial deleted successfully"}
     except HTTPException:
         raise
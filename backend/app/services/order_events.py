@@ -0,0 +1,114 @@
+"""In-process pub/sub of order events, fanned out to dashboard streams
+
+Order writes publish "order.created" and "order.status_changed" events here;
+every open /dashboard/orders/stream connection gets its own bounded queue, so
+any number of admins watching costs no database reads.
+
+With ORDER_EVENTS_CHANGE_STREAM=true the events come from a MongoDB change
+stream on orders instead (requires a replica set). Every worker then sees writes
+made by every other worker, and the direct publishes are skipped so nothing is
+delivered twice.
+"""
+import asyncio
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+
+# Events buffered per subscriber before the oldest are dropped (a stalled client must not grow memory)
+SUBSCRIBER_QUEUE_SIZE = 256
+# Order fields carried in events; enough to update a list row without refetching
+_EVENT_FIELDS = ("status", "total", "paymentMethod", "paymentSessionId", "customerEmail", "customerName", "createdAt")
+
+
+def _event_order(order: dict) -> dict:
+    event = {field: order.get(field) for field in _EVENT_FIELDS if field in order}
+    if "_id" in order:
+        event["id"] = str(order["_id"])
+    if isinstance(event.get("createdAt"), datetime):
+        event["createdAt"] = event["createdAt"].isoformat()
+    return event
+
+
+class OrderEventBus:
+    """Fan-out of order events to per-subscriber queues on the running event loop"""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, order: dict, previous_status: Optional[str] = None) -> None:
+        event = {
+            "type": event_type,
+            "order": _event_order(order),
+            "at": datetime.now(timezone.utc).isoformat(),
+        }
+        if previous_status is not None:
+            event["previousStatus"] = previous_status
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    @contextmanager
+    def subscribe(self) -> Iterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    # Direct publishing from the write paths; skipped when the change stream is the source
+
+    def order_created(self, order: dict) -> None:
+        if not settings.ORDER_EVENTS_CHANGE_STREAM:
+            self.publish(ORDER_CREATED, order)
+
+    def status_changed(self, before: Optional[dict], new_status: str) -> None:
+        """Publish a status change given the pre-update document (as used for the counters)"""
+        if settings.ORDER_EVENTS_CHANGE_STREAM or not before:
+            return
+        previous = before.get("status") or "pending"
+        if previous != new_status:
+            self.publish(ORDER_STATUS_CHANGED, {**before, "status": new_status}, previous_status=previous)
+
+
+order_events = OrderEventBus()
+
+
+async def watch_order_changes(database) -> None:
+    """Publish inserts and status updates from a change stream on orders, resuming after errors"""
+    pipeline = [{"$match": {"$or": [
+        {"operationType": "insert"},
+        {"operationType": "update", "updateDescription.updatedFields.status": {"$exists": True}},
+    ]}}]
+    resume_token = None
+    while True:
+        try:
+            async with database.orders.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                logger.info("Watching orders change stream for dashboard events")
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    order = change.get("fullDocument") or {"_id": change["documentKey"]["_id"]}
+                    if change["operationType"] == "insert":
+                        order_events.publish(ORDER_CREATED, order)
+                    else:
+                        order = {**order, "status": change["updateDescription"]["updatedFields"]["status"]}
+                        order_events.publish(ORDER_STATUS_CHANGED, order)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Orders change stream failed, retrying in 5s: {e}")
+            await asyncio.sleep(5)
@@ -0,0 +1,55 @@
+"""Admin order search over indexed customer and gateway fields"""
+from app.core.database import db
+from typing import Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Lowercased, trimmed email, stored as customerEmailLower for index-backed prefix search"""
+    if not email:
+        return None
+    return email.strip().lower()
+
+
+class OrderSearchService:
+    """Builds search filters that every index in the registry can serve"""
+
+    @staticmethod
+    def search_fields(order: dict) -> dict:
+        """Derived fields to store alongside a new order"""
+        return {"customerEmailLower": normalize_email(order.get("customerEmail"))}
+
+    @staticmethod
+    def build_query(email: Optional[str] = None, name: Optional[str] = None, payment_id: Optional[str] = None) -> dict:
+        """AND of the given criteria; raises ValueError when none is given.
+
+        - email: case-insensitive prefix, as an anchored case-sensitive regex on the
+          lowercased field so it stays a bounded index scan
+        - name: word search on the customerName text index
+        - payment_id: exact gateway session or payment intent ID
+        """
+        clauses = []
+        prefix = normalize_email(email)
+        if prefix:
+            clauses.append({"customerEmailLower": {"$regex": "^" + re.escape(prefix)}})
+        if name and name.strip():
+            clauses.append({"$text": {"$search": name.strip()}})
+        if payment_id and payment_id.strip():
+            payment_id = payment_id.strip()
+            clauses.append({"$or": [{"paymentSessionId": payment_id}, {"paymentIntentId": payment_id}]})
+        if not clauses:
+            raise ValueError("Provide at least one of: email, name, payment_id")
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    @staticmethod
+    async def backfill() -> int:
+        """Fill customerEmailLower on orders stored before it existed; returns how many were updated"""
+        result = await db.orders.update_many(
+            {"customerEmail": {"$type": "string"}, "customerEmailLower": {"$exists": False}},
+            [{"$set": {"customerEmailLower": {"$toLower": {"$trim": {"input": "$customerEmail"}}}}}],
+        )
+        logger.info(f"Backfilled customerEmailLower on {result.modified_count} order(s)")
+        return result.modified_count
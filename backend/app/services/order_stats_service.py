@@ -0,0 +1,394 @@
+"""Materialized order counters - O(1) dashboard stats and per-product sales"""
+from app.core.database import db
+from app.models.orders import PaymentStats
+from pymongo import ReplaceOne, UpdateOne
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone, timedelta
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fields of an order the counters and order events need from the pre-update document
+TRANSITION_PROJECTION = {
+    "status": 1,
+    "total": 1,
+    "createdAt": 1,
+    "paymentMethod": 1,
+    "paymentSessionId": 1,
+    "customerEmail": 1,
+    "customerName": 1,
+    "items": 1,
+}
+
+# order_stats holds one "totals" document and one "day:YYYY-MM-DD" bucket per UTC day of
+# order creation; order_rollups holds one document per UTC hour of order creation, keyed by
+# the hour's start. All are shaped {orders, byStatus: {<status>: {count, revenue}}}
+TOTALS_ID = "totals"
+
+# product_sales holds one "<productId>:<YYYY-MM-DD>" document per product and UTC day of order
+# creation, shaped {productId, day, name, orders, paidOrders, units, revenue}: orders counts every
+# order listing the product, the rest only paid ones. Plus one "meta" document set by rebuilds.
+PRODUCT_SALES_META_ID = "meta"
+
+# Revenue series granularity -> $dateToString format of a bucket label
+SERIES_FORMATS = {"hour": "%Y-%m-%dT%H:00", "day": "%Y-%m-%d", "month": "%Y-%m"}
+
+
+def _day(created_at: Optional[datetime]) -> str:
+    """UTC calendar day an order was created on (stored datetimes are naive UTC)"""
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+    elif created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.strftime("%Y-%m-%d")
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """Naive UTC, like the datetimes pymongo returns"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _hour(created_at: Optional[datetime]) -> datetime:
+    """Start of the UTC hour an order was created in"""
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+    return _naive_utc(created_at).replace(minute=0, second=0, microsecond=0)
+
+
+def _bucket_start(moment: datetime, granularity: str) -> datetime:
+    moment = _hour(moment)
+    if granularity in ("day", "month"):
+        moment = moment.replace(hour=0)
+    if granularity == "month":
+        moment = moment.replace(day=1)
+    return moment
+
+
+def _next_bucket(start: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return start + timedelta(hours=1)
+    if granularity == "day":
+        return start + timedelta(days=1)
+    return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+
+def _status_inc(status: str, count: int, revenue: float) -> dict:
+    return {f"byStatus.{status}.count": count, f"byStatus.{status}.revenue": revenue}
+
+
+def _order_products(order: dict) -> Dict[str, dict]:
+    """Name, units and line revenue (price x quantity) per product in an order"""
+    products: Dict[str, dict] = {}
+    for item in order.get("items") or []:
+        if item.get("productId") is None:
+            continue
+        product = products.setdefault(str(item["productId"]), {"units": 0, "revenue": 0})
+        # Last line wins, like $last in the rebuild pipeline
+        product["name"] = item.get("name")
+        quantity = item.get("quantity") or 0
+        product["units"] += quantity
+        product["revenue"] += (item.get("price") or 0) * quantity
+    return products
+
+
+def _product_changes(order: dict, orders: int, paid: int) -> List[Tuple[str, str, Optional[str], dict]]:
+    """(day, productId, name, $inc) for every product in an order"""
+    day = _day(order.get("createdAt"))
+    changes = []
+    for product_id, product in _order_products(order).items():
+        inc = {"orders": orders, "paidOrders": paid, "units": paid * product["units"], "revenue": paid * product["revenue"]}
+        changes.append((day, product_id, product["name"], {field: delta for field, delta in inc.items() if delta}))
+    return [change for change in changes if change[3]]
+
+
+def _product_sales_pipeline(match: dict, by_day: bool) -> list:
+    """Orders matching ``match`` -> per product (and UTC creation day): orders, paid orders, paid units and revenue"""
+    order_key = {"order": "$_id", "product": "$items.productId"}
+    product_key = "$_id.product"
+    if by_day:
+        order_key["day"] = {"$dateToString": {"format": "%Y-%m-%d", "date": "$createdAt"}}
+        product_key = {"product": "$_id.product", "day": "$_id.day"}
+    return [
+        {"$match": match},
+        {"$project": {"createdAt": 1, "items": 1, "paid": {"$eq": [{"$ifNull": ["$status", "pending"]}, "paid"]}}},
+        {"$unwind": "$items"},
+        # Lines without a product are skipped, as the incremental path does
+        {"$match": {"items.productId": {"$ne": None}}},
+        # An order may list a product on several lines: one row per (order, product) first
+        {"$group": {
+            "_id": order_key,
+            "name": {"$last": "$items.name"},
+            "createdAt": {"$first": "$createdAt"},
+            "paid": {"$first": "$paid"},
+            "units": {"$sum": "$items.quantity"},
+            "revenue": {"$sum": {"$multiply": ["$items.price", "$items.quantity"]}},
+        }},
+        # $group output is unordered; sort so the name is the one on the newest order
+        {"$sort": {"createdAt": 1, "_id.order": 1}},
+        {"$group": {
+            "_id": product_key,
+            "name": {"$last": "$name"},
+            "orders": {"$sum": 1},
+            "paidOrders": {"$sum": {"$cond": ["$paid", 1, 0]}},
+            "units": {"$sum": {"$cond": ["$paid", "$units", 0]}},
+            "revenue": {"$sum": {"$cond": ["$paid", "$revenue", 0]}},
+        }},
+    ]
+
+
+class OrderStatsService:
+    """Keeps order_stats in step with orders using $inc, and reads it back for the dashboard"""
+
+    @staticmethod
+    async def _apply(
+        changes: List[Tuple[Optional[datetime], dict]],
+        product_changes: List[Tuple[str, str, Optional[str], dict]] = (),
+    ) -> None:
+        """Apply (order createdAt, $inc) pairs and product changes, merged per bucket: one bulk_write per collection"""
+        totals: dict = {}
+        days: dict = {}
+        hours: dict = {}
+        for created_at, inc in changes:
+            for target in (totals, days.setdefault(_day(created_at), {}), hours.setdefault(_hour(created_at), {})):
+                for field, delta in inc.items():
+                    target[field] = target.get(field, 0) + delta
+        products: dict = {}
+        for day, product_id, name, inc in product_changes:
+            product = products.setdefault((product_id, day), {"name": name, "inc": {}})
+            product["name"] = name or product["name"]
+            for field, delta in inc.items():
+                product["inc"][field] = product["inc"].get(field, 0) + delta
+        if not totals:
+            return
+        stats_ops = [UpdateOne({"_id": TOTALS_ID}, {"$inc": totals}, upsert=True)]
+        stats_ops += [
+            UpdateOne({"_id": f"day:{day}"}, {"$inc": inc, "$setOnInsert": {"day": day}}, upsert=True)
+            for day, inc in days.items()
+        ]
+        rollup_ops = [UpdateOne({"_id": hour}, {"$inc": inc}, upsert=True) for hour, inc in hours.items()]
+        product_ops = [
+            UpdateOne(
+                {"_id": f"{product_id}:{day}"},
+                {"$inc": product["inc"], "$set": {"name": product["name"]}, "$setOnInsert": {"productId": product_id, "day": day}},
+                upsert=True,
+            )
+            for (product_id, day), product in products.items()
+        ]
+        try:
+            writes = [
+                db.order_stats.bulk_write(stats_ops, ordered=False),
+                db.order_rollups.bulk_write(rollup_ops, ordered=False),
+            ]
+            if product_ops:
+                writes.append(db.product_sales.bulk_write(product_ops, ordered=False))
+            await asyncio.gather(*writes)
+        except Exception as e:
+            # The order writes already succeeded; counters are repaired by rebuild_order_stats.py
+            logger.warning(f"Could not update order_stats: {e}")
+
+    @staticmethod
+    async def record_created(order: dict) -> None:
+        """Count a newly inserted order"""
+        status = order.get("status") or "pending"
+        inc = {"orders": 1, **_status_inc(status, 1, order.get("total", 0))}
+        product_changes = _product_changes(order, 1, 1 if status == "paid" else 0)
+        await OrderStatsService._apply([(order.get("createdAt"), inc)], product_changes)
+
+    @staticmethod
+    def _transition(before: Optional[dict], new_status: str) -> Optional[Tuple[Optional[datetime], dict]]:
+        if not before:
+            return None
+        old_status = before.get("status") or "pending"
+        if old_status == new_status:
+            return None
+        total = before.get("total", 0)
+        return before.get("createdAt"), {**_status_inc(old_status, -1, -total), **_status_inc(new_status, 1, total)}
+
+    @staticmethod
+    async def record_transition(before: Optional[dict], new_status: str) -> None:
+        """Move an order between status counters.
+
+        ``before`` is the order as it was prior to the update (find_one_and_update
+        with ReturnDocument.BEFORE), so concurrent updates each see the real
+        previous status and repeated webhooks for a paid order change nothing.
+        """
+        await OrderStatsService.record_transitions([(before, new_status)])
+
+    @staticmethod
+    async def record_transitions(transitions: List[Tuple[Optional[dict], str]]) -> None:
+        """Move many orders between status counters in one round trip per collection"""
+        changes = []
+        product_changes = []
+        for before, new_status in transitions:
+            change = OrderStatsService._transition(before, new_status)
+            if change:
+                changes.append(change)
+                # Units and revenue only count while an order is paid
+                paid = (new_status == "paid") - ((before.get("status") or "pending") == "paid")
+                if paid:
+                    product_changes += _product_changes(before, 0, paid)
+        await OrderStatsService._apply(changes, product_changes)
+
+    @staticmethod
+    async def get_payment_stats(today: datetime) -> Optional[PaymentStats]:
+        """Stats from the totals document and today's bucket, or None until a rebuild has set the baseline"""
+        day_id = f"day:{_day(today)}"
+        docs = {doc["_id"]: doc async for doc in db.order_stats.find({"_id": {"$in": [TOTALS_ID, day_id]}})}
+        totals = docs.get(TOTALS_ID)
+        # Counters only become trustworthy once a rebuild has counted the orders that predate them
+        if not totals or "rebuiltAt" not in totals:
+            return None
+        by_status = totals.get("byStatus", {})
+        today_doc = docs.get(day_id, {})
+        today_paid = today_doc.get("byStatus", {}).get("paid", {})
+        return PaymentStats(
+            totalOrders=totals.get("orders", 0),
+            totalRevenue=by_status.get("paid", {}).get("revenue", 0),
+            pendingOrders=by_status.get("pending", {}).get("count", 0),
+            paidOrders=by_status.get("paid", {}).get("count", 0),
+            failedOrders=by_status.get("failed", {}).get("count", 0),
+            todayRevenue=today_paid.get("revenue", 0),
+            todayOrders=today_doc.get("orders", 0),
+        )
+
+    @staticmethod
+    async def revenue_series(granularity: str, start: datetime, end: datetime) -> List[dict]:
+        """Orders, paid orders and paid revenue for every bucket overlapping [start, end), empty ones included.
+
+        Read from the hourly rollups once a rebuild has set their baseline, else
+        grouped over the orders themselves (rollups alone would miss older orders).
+        """
+        label_format = SERIES_FORMATS[granularity]
+        end = _naive_utc(end)
+        buckets = [_bucket_start(start, granularity)]
+        while _next_bucket(buckets[-1], granularity) < end:
+            buckets.append(_next_bucket(buckets[-1], granularity))
+        window = {"$gte": buckets[0], "$lt": _next_bucket(buckets[-1], granularity)}
+        totals = await db.order_stats.find_one({"_id": TOTALS_ID}, {"rebuiltAt": 1})
+        if totals and "rebuiltAt" in totals:
+            collection = db.order_rollups
+            pipeline = [
+                {"$match": {"_id": window}},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": label_format, "date": "$_id"}},
+                    "orders": {"$sum": "$orders"},
+                    "paidOrders": {"$sum": "$byStatus.paid.count"},
+                    "revenue": {"$sum": "$byStatus.paid.revenue"},
+                }},
+            ]
+        else:
+            collection = db.orders
+            paid = {"$eq": ["$status", "paid"]}
+            pipeline = [
+                {"$match": {"createdAt": window}},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": label_format, "date": "$createdAt"}},
+                    "orders": {"$sum": 1},
+                    "paidOrders": {"$sum": {"$cond": [paid, 1, 0]}},
+                    "revenue": {"$sum": {"$cond": [paid, "$total", 0]}},
+                }},
+            ]
+        rows = {row["_id"]: row async for row in collection.aggregate(pipeline)}
+        series = []
+        for bucket in buckets:
+            row = rows.get(bucket.strftime(label_format), {})
+            series.append({
+                "bucket": bucket.strftime(label_format),
+                "start": bucket.replace(tzinfo=timezone.utc),
+                "orders": row.get("orders", 0),
+                "paidOrders": row.get("paidOrders", 0),
+                "revenue": row.get("revenue", 0),
+            })
+        return series
+
+    @staticmethod
+    async def product_performance(start: datetime, end: datetime) -> Optional[List[dict]]:
+        """Per-product totals for the UTC days overlapping [start, end) from product_sales,
+        or None until a rebuild has set the baseline"""
+        meta = await db.product_sales.find_one({"_id": PRODUCT_SALES_META_ID})
+        if not meta or "rebuiltAt" not in meta:
+            return None
+        last_day = _day(_naive_utc(end) - timedelta(microseconds=1))
+        pipeline = [
+            {"$match": {"day": {"$gte": _day(start), "$lte": last_day}}},
+            # Oldest day first, so $last picks the name from the latest day
+            {"$sort": {"day": 1}},
+            {"$group": {
+                "_id": "$productId",
+                "name": {"$last": "$name"},
+                "orders": {"$sum": "$orders"},
+                "paidOrders": {"$sum": "$paidOrders"},
+                "units": {"$sum": "$units"},
+                "revenue": {"$sum": "$revenue"},
+            }},
+        ]
+        return await db.product_sales.aggregate(pipeline).to_list(None)
+
+    @staticmethod
+    async def product_performance_live(start: datetime, end: datetime) -> List[dict]:
+        """Per-product totals for orders created in [start, end), aggregated over orders"""
+        match = {"createdAt": {"$gte": start, "$lt": end}}
+        return await db.orders.aggregate(_product_sales_pipeline(match, by_day=False)).to_list(None)
+
+    @staticmethod
+    async def rebuild() -> dict:
+        """Recount order_stats and order_rollups from the orders collection (repairs drift; run when writes are quiet)"""
+        pipeline = [
+            {"$group": {
+                "_id": {
+                    "hour": {"$dateToString": {"format": "%Y-%m-%dT%H", "date": "$createdAt"}},
+                    "status": {"$ifNull": ["$status", "pending"]},
+                },
+                "count": {"$sum": 1},
+                "revenue": {"$sum": "$total"},
+            }},
+        ]
+        rebuilt_at = datetime.now(timezone.utc)
+        totals = {"_id": TOTALS_ID, "orders": 0, "byStatus": {}, "rebuiltAt": rebuilt_at}
+        days = {}
+        hours = {}
+        async for row in db.orders.aggregate(pipeline):
+            # Orders without createdAt count as created now, as the Order model defaults them
+            hour = row["_id"]["hour"] or _hour(rebuilt_at).strftime("%Y-%m-%dT%H")
+            day, status = hour[:10], row["_id"]["status"]
+            day_bucket = days.setdefault(day, {"_id": f"day:{day}", "day": day, "orders": 0, "byStatus": {}})
+            hour_start = datetime.strptime(hour, "%Y-%m-%dT%H")
+            hour_bucket = hours.setdefault(hour_start, {"_id": hour_start, "orders": 0, "byStatus": {}})
+            for doc in (totals, day_bucket, hour_bucket):
+                doc["orders"] += row["count"]
+                counter = doc["byStatus"].setdefault(status, {"count": 0, "revenue": 0})
+                counter["count"] += row["count"]
+                counter["revenue"] += row["revenue"]
+        # Replace in place rather than delete-then-insert, so a concurrent $inc upsert can't collide
+        for collection, docs in ((db.order_stats, [totals, *days.values()]), (db.order_rollups, list(hours.values()))):
+            if docs:
+                await collection.bulk_write([ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs])
+            await collection.delete_many({"_id": {"$nin": [doc["_id"] for doc in docs]}})
+        products = await OrderStatsService._rebuild_product_sales(rebuilt_at)
+        logger.info(
+            f"Rebuilt order_stats: {totals['orders']} orders over {len(days)} day(s), {len(hours)} hour bucket(s), "
+            f"{products} product-day bucket(s)"
+        )
+        return {"orders": totals["orders"], "days": len(days), "hours": len(hours), "products": products, "rebuiltAt": rebuilt_at}
+
+    @staticmethod
+    async def _rebuild_product_sales(rebuilt_at: datetime) -> int:
+        """Recount product_sales with an $unwind/$group over every order's items"""
+        buckets: dict = {}
+        async for row in db.orders.aggregate(_product_sales_pipeline({}, by_day=True)):
+            product_id = str(row["_id"]["product"])
+            # Orders without createdAt count as created now, as in the order_stats rebuild
+            day = row["_id"]["day"] or _day(rebuilt_at)
+            bucket = buckets.setdefault(f"{product_id}:{day}", {
+                "_id": f"{product_id}:{day}", "productId": product_id, "day": day, "name": row["name"],
+                "orders": 0, "paidOrders": 0, "units": 0, "revenue": 0,
+            })
+            for field in ("orders", "paidOrders", "units", "revenue"):
+                bucket[field] += row[field]
+        docs = [{"_id": PRODUCT_SALES_META_ID, "rebuiltAt": rebuilt_at}, *buckets.values()]
+        await db.product_sales.bulk_write([ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs])
+        await db.product_sales.delete_many({"_id": {"$nin": [doc["_id"] for doc in docs]}})
+        return len(buckets)
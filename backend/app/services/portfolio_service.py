@@ -3,7 +3,7 @@ Portfolio Service
 Business logic for portfolio operations
 """
 from typing import List, Optional
-from app.core.database import db
+from app.core.database import content_read_db
 from app.core.logging_config import setup_logging
 
 logger = setup_logging()
@@ -17,7 +17,7 @@ class PortfolioService:
         """Get all projects, optionally filtered by category"""
         try:
             query = {} if not category or category == "All" else {"category": category}
-            projects = await db.projects.find(query, {"_id": 0}).to_list(100)
+            projects = await content_read_db("projects").projects.find(query, {"_id": 0}).to_list(100)
             return projects if projects else []
         except Exception as e:
             logger.error(f"Error fetching projects: {e}")
@@ -27,7 +27,7 @@ class PortfolioService:
     async def get_project_categories() -> List[str]:
         """Get all unique project categories"""
         try:
-            categories = await db.projects.distinct("category")
+            categories = await content_read_db("projects").projects.distinct("category")
             return categories if categories else []
         except Exception as e:
             logger.error(f"Error fetching categories: {e}")
@@ -37,7 +37,7 @@ class PortfolioService:
     async def get_project_by_id(project_id: str) -> Optional[dict]:
         """Get a specific project by ID"""
         try:
-            project = await db.projects.find_one({"id": project_id}, {"_id": 0})
+            project = await content_read_db("projects").projects.find_one({"id": project_id}, {"_id": 0})
             return project
         except Exception as e:
             logger.error(f"Error fetching project: {e}")
@@ -0,0 +1,20 @@
+"""
+Script to fill the normalized search fields on orders created before order search existed
+Safe to re-run: only orders missing the fields are touched
+Usage: python backfill_order_search.py
+"""
+import asyncio
+
+from app.services.order_search_service import OrderSearchService
+
+# Note: This script uses the database connection from app.core.database
+# Make sure MongoDB is running before executing this script
+
+
+async def backfill_order_search():
+    updated = await OrderSearchService.backfill()
+    print(f"✓ Backfilled {updated} order(s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_order_search())
@@ -0,0 +1,81 @@
+"""
+Script to export the bootstrap payload and each content collection as static JSON
+Run after content changes; start the API with STATIC_SNAPSHOT_DIR pointing at the output
+to serve these files without touching MongoDB
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from app.core.cache import Fallback, encode_snapshot
+from app.core.defaults import defaults
+from app.core.static_snapshot import write_manifest, write_snapshot
+from app.routes.bootstrap import ALL_SECTIONS, _gather_sections
+from app.routes.nav_links import _load_nav_links
+from app.routes.personal_info import _load_personal_info
+from app.routes.products import _load_products
+from app.routes.projects import _load_projects
+from app.routes.services import _load_services
+from app.routes.skills import _load_skills
+from app.routes.stats import _load_stats
+from app.routes.testimonials import _load_testimonials
+
+# Note: This script uses the database connection from app.core.database
+# Make sure MongoDB is running and seeded before executing this script: the export fails
+# rather than write placeholder content for an unreachable database or an empty collection
+
+
+class DefaultContentError(RuntimeError):
+    """A builder served default content instead of reading it from MongoDB."""
+
+
+def _real(key: str, value):
+    if isinstance(value, Fallback) or defaults.is_default(value):
+        raise DefaultContentError(f"{key}: MongoDB is unreachable or the collection is empty; defaults would be exported")
+    return value
+
+
+async def _build_bootstrap_checked():
+    """The full bootstrap payload, refusing any section that fell back to defaults"""
+    results = await _gather_sections(ALL_SECTIONS)
+    return encode_snapshot({name: _real(f"bootstrap.{name}", result) for name, result in zip(ALL_SECTIONS, results)})
+
+
+# Cache key (as used by the routes) -> snapshot builder
+BUILDERS = {
+    "bootstrap": _build_bootstrap_checked,
+    "personal_info": _load_personal_info,
+    "stats": _load_stats,
+    "nav_links": _load_nav_links,
+    "services": _load_services,
+    "projects": _load_projects,
+    "products": _load_products,
+    "testimonials": _load_testimonials,
+    "skills": _load_skills,
+}
+
+
+async def export_static(out_dir: Path):
+    """Render every snapshot and write it, plus manifest.json, to out_dir"""
+    # Build everything before writing anything, so a failure leaves the previous export intact
+    snapshots = {key: _real(key, await build()) for key, build in BUILDERS.items()}
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Exporting static snapshots to {out_dir}...")
+    entries = {}
+    for key, snapshot in snapshots.items():
+        entries[key] = write_snapshot(out_dir, key, snapshot)
+        print(f"✓ Exported {key} -> {entries[key]['file']}")
+    write_manifest(out_dir, entries)
+    print("\nStatic export completed successfully!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default="static_snapshot", help="output directory (default: static_snapshot)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(export_static(Path(args.out)))
+    except Exception as e:
+        print(f"✗ Static export failed: {e}", file=sys.stderr)
+        sys.exit(1)
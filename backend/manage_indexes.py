@@ -0,0 +1,31 @@
+"""
+Script to apply the application's MongoDB indexes and report drift
+Usage: python manage_indexes.py [--check]
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.database import db
+from app.core.indexes import sync_indexes
+
+# Note: This script uses the database connection from app.core.database
+# Make sure MongoDB is running before executing this script
+
+
+async def manage_indexes(check: bool) -> int:
+    """Apply (or with check, only compare) the index registry; return a process exit code"""
+    report = await sync_indexes(db, apply=not check)
+    for kind, entries in report.items():
+        print(f"{kind}: {len(entries)}")
+        for entry in entries:
+            print(f"  - {entry}")
+    drift = report["missing"] or report["conflicting"]
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply or check MongoDB indexes")
+    parser.add_argument("--check", action="store_true", help="report drift without creating indexes")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(manage_indexes(args.check)))
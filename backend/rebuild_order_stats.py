@@ -0,0 +1,21 @@
+"""
+Script to recount the order_stats counters, order_rollups and product_sales from the orders collection
+Run once after deploying the counters, and whenever dashboard stats drift
+Usage: python rebuild_order_stats.py
+"""
+import asyncio
+
+from app.services.order_stats_service import OrderStatsService
+
+# Note: This script uses the database connection from app.core.database
+# Make sure MongoDB is running before executing this script
+
+
+async def rebuild_order_stats():
+    result = await OrderStatsService.rebuild()
+    print(f"✓ Counted {result['orders']} orders over {result['days']} day(s) and {result['hours']} hour bucket(s)")
+    print(f"✓ Counted product sales into {result['products']} product-day bucket(s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_order_stats())
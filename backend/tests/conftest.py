@@ -0,0 +1,49 @@
+"""Shared fixtures: the app runs on the in-memory MongoDB backend, no server needed"""
+import os
+
+# Settings are read at import time, so configure the backend before importing the app
+os.environ["MONGO_BACKEND"] = "memory"
+os.environ["MONGO_MEMORY_SEED"] = "false"
+os.environ["MONGO_MEMORY_LATENCY_MS"] = "0"
+os.environ["MONGO_ENSURE_INDEXES"] = "false"
+os.environ["ORDER_EVENTS_CHANGE_STREAM"] = "false"
+os.environ["STATIC_SNAPSHOT_DIR"] = ""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.auth import create_access_token
+from app.core.cache import content_cache
+from app.core.config import settings
+from app.core.database import client as memory_client, db_breaker
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Every test starts with no collections or indexes, an empty unpinned content cache and a closed breaker"""
+    memory_client[settings.DB_NAME]._collections.clear()
+    content_cache.clear()
+    content_cache._refreshing.clear()
+    content_cache._written_at.clear()
+    content_cache._pinned.clear()
+    db_breaker._failures = 0
+    db_breaker._opened_at = None
+    yield
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def run(client):
+    """Call an async function on the app's event loop and return its result"""
+    return lambda fn, *args: client.portal.call(fn, *args)
+
+
+@pytest.fixture
+def admin_headers():
+    return {"Authorization": f"Bearer {create_access_token('admin')}"}
@@ -0,0 +1,96 @@
+"""Bulk order status endpoint"""
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from app.core import memory_db
+from app.core.database import db
+from app.services.order_stats_service import OrderStatsService
+
+
+def _seed(run, *statuses):
+    ids = []
+    for i, status in enumerate(statuses):
+        order = {"total": 10, "items": [], "paymentSessionId": f"sess_{i}"}
+        if status is not None:
+            order["status"] = status
+        ids.append(str(run(db.orders.insert_one, order).inserted_id))
+    run(OrderStatsService.rebuild)
+    return ids
+
+
+def _stats(client, admin_headers):
+    return client.get("/api/dashboard/stats", headers=admin_headers).json()
+
+
+def test_result_per_item(client, run, admin_headers):
+    ids = _seed(run, "pending", "paid", None)
+    updates = [
+        {"id": ids[0], "status": "paid"},
+        {"id": "sess_1", "status": "paid"},
+        {"id": ids[2], "status": "failed"},
+        {"id": ids[0], "status": "failed"},
+        {"id": str(ObjectId()), "status": "paid"},
+        {"id": ids[1], "status": "shipped"},
+    ]
+    body = client.post("/api/dashboard/orders/bulk-status", json={"updates": updates}, headers=admin_headers).json()
+    assert [result["result"] for result in body["results"]] == [
+        "updated", "unchanged", "updated", "duplicate", "not_found", "invalid_status",
+    ]
+    assert body["updated"] == 2
+    stats = _stats(client, admin_headers)
+    assert stats["paidOrders"] == 2 and stats["failedOrders"] == 1 and stats["pendingOrders"] == 0
+
+
+def test_concurrent_change_is_a_conflict(client, run, admin_headers, monkeypatch):
+    """Regression: a status changed between the read and the write must not move the counters again"""
+    ids = _seed(run, "pending", "pending")
+    bulk_write = memory_db.MemoryCollection.bulk_write
+
+    async def racing_bulk_write(self, requests, **kwargs):
+        if self.name == "orders":
+            # Another admin refunds the first order just before our write lands
+            await self.update_one({"_id": ObjectId(ids[0])}, {"$set": {"status": "refunded"}})
+            await OrderStatsService.record_transition({"status": "pending", "total": 10}, "refunded")
+        return await bulk_write(self, requests, **kwargs)
+
+    monkeypatch.setattr(memory_db.MemoryCollection, "bulk_write", racing_bulk_write)
+    updates = [{"id": order_id, "status": "paid"} for order_id in ids]
+    body = client.post("/api/dashboard/orders/bulk-status", json={"updates": updates}, headers=admin_headers).json()
+
+    assert [result["result"] for result in body["results"]] == ["conflict", "updated"]
+    assert body["updated"] == 1
+    order = client.get(f"/api/dashboard/orders/{ids[0]}", headers=admin_headers).json()
+    assert order["status"] == "refunded"
+    stats = _stats(client, admin_headers)
+    assert stats["paidOrders"] == 1 and stats["pendingOrders"] == 0 and stats["totalRevenue"] == 10
+
+
+def test_landed_write_touched_again_still_counts(client, run, admin_headers, monkeypatch):
+    """Regression: a later write moving updatedAt must not turn a landed write into a conflict"""
+    ids = _seed(run, "pending", "pending")
+    bulk_write = memory_db.MemoryCollection.bulk_write
+
+    async def racing_bulk_write(self, requests, **kwargs):
+        if self.name != "orders":
+            return await bulk_write(self, requests, **kwargs)
+        await self.update_one({"_id": ObjectId(ids[0])}, {"$set": {"status": "refunded"}})
+        await OrderStatsService.record_transition({"status": "pending", "total": 10}, "refunded")
+        result = await bulk_write(self, requests, **kwargs)
+        # e.g. a shipping update right after the status change
+        await self.update_one({"_id": ObjectId(ids[1])}, {"$set": {"updatedAt": datetime.now(timezone.utc) + timedelta(seconds=1)}})
+        return result
+
+    monkeypatch.setattr(memory_db.MemoryCollection, "bulk_write", racing_bulk_write)
+    updates = [{"id": order_id, "status": "paid"} for order_id in ids]
+    body = client.post("/api/dashboard/orders/bulk-status", json={"updates": updates}, headers=admin_headers).json()
+
+    assert [result["result"] for result in body["results"]] == ["conflict", "updated"]
+    stats = _stats(client, admin_headers)
+    assert stats["paidOrders"] == 1 and stats["pendingOrders"] == 0
+
+
+def test_batch_size_is_capped(client, admin_headers):
+    updates = [{"id": str(i), "status": "paid"} for i in range(5001)]
+    response = client.post("/api/dashboard/orders/bulk-status", json={"updates": updates}, headers=admin_headers)
+    assert response.status_code == 400
@@ -0,0 +1,85 @@
+"""Circuit breaker around the MongoDB handle"""
+import asyncio
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from app.core.circuit_breaker import CircuitBreaker, DatabaseUnavailable, GuardedHandle
+from app.core.memory_db import MemoryClient
+
+
+class _Probe:
+    def __init__(self):
+        self.healthy = False
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if not self.healthy:
+            raise ServerSelectionTimeoutError("still down")
+
+
+def _guarded(threshold=2, reset_timeout=0):
+    probe = _Probe()
+    breaker = CircuitBreaker(failure_threshold=threshold, reset_timeout=reset_timeout, probe=probe)
+    return GuardedHandle(MemoryClient()["test"], breaker), breaker, probe
+
+
+def _fail_find_one(monkeypatch):
+    async def down(*args, **kwargs):
+        raise ServerSelectionTimeoutError("no servers")
+    monkeypatch.setattr("app.core.memory_db.MemoryCollection.find_one", down)
+
+
+def test_opens_after_consecutive_failures(monkeypatch):
+    async def scenario():
+        handle, breaker, _ = _guarded(threshold=2, reset_timeout=60)
+        _fail_find_one(monkeypatch)
+        for _ in range(2):
+            with pytest.raises(ServerSelectionTimeoutError):
+                await handle.items.find_one({})
+        assert breaker.is_open
+        # Open: calls fail at once without reaching the backend
+        monkeypatch.undo()
+        with pytest.raises(DatabaseUnavailable):
+            await handle.items.find_one({})
+
+    asyncio.run(scenario())
+
+
+def test_success_resets_failure_count(monkeypatch):
+    async def scenario():
+        handle, breaker, _ = _guarded(threshold=2)
+        with monkeypatch.context() as outage:
+            _fail_find_one(outage)
+            with pytest.raises(ServerSelectionTimeoutError):
+                await handle.items.find_one({})
+        assert await handle.items.find_one({}) is None
+        with monkeypatch.context() as outage:
+            _fail_find_one(outage)
+            with pytest.raises(ServerSelectionTimeoutError):
+                await handle.items.find_one({})
+        assert not breaker.is_open
+
+    asyncio.run(scenario())
+
+
+def test_probe_closes_breaker_once_healthy():
+    async def scenario():
+        handle, breaker, probe = _guarded(threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.is_open
+
+        with pytest.raises(DatabaseUnavailable):
+            await handle.items.find_one({})
+        await asyncio.sleep(0)
+        assert probe.calls == 1 and breaker.is_open
+
+        probe.healthy = True
+        with pytest.raises(DatabaseUnavailable):
+            await handle.items.find_one({})
+        await asyncio.sleep(0)
+        assert not breaker.is_open
+        assert await handle.items.find_one({}) is None
+
+    asyncio.run(scenario())
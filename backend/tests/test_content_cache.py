@@ -0,0 +1,131 @@
+"""Snapshot cache, ETag revalidation and fallback handling for public content"""
+import asyncio
+
+import pytest
+
+from app.core import memory_db
+from app.core.cache import content_cache
+from app.core.config import settings
+from app.core.database import db
+
+REAL_PROJECT = {
+    "id": "real",
+    "title": "REAL",
+    "description": "Stored project",
+    "image": "/real.png",
+    "category": "Web Development",
+    "technologies": ["Python"],
+    "link": "#",
+    "github": "#",
+}
+
+
+def _fail_reads(monkeypatch):
+    """Make every find/aggregate on the memory backend fail like an unreachable server"""
+    def down(*args, **kwargs):
+        raise RuntimeError("MongoDB is down")
+    monkeypatch.setattr(memory_db.MemoryCollection, "find", down)
+    monkeypatch.setattr(memory_db.MemoryCollection, "find_one", down)
+    monkeypatch.setattr(memory_db.MemoryCollection, "aggregate", down)
+
+
+def test_etag_revalidation_returns_304(client):
+    first = client.get("/api/projects")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.get("/api/projects", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_max_age_follows_cache_ttl(client):
+    cache_control = client.get("/api/bootstrap").headers["cache-control"]
+    assert f"max-age={settings.CONTENT_CACHE_TTL_SECONDS}," in cache_control
+
+
+def test_compressed_variant_is_negotiated(client, run):
+    run(db.projects.insert_many, [{**REAL_PROJECT, "id": str(i), "description": "x" * 200} for i in range(5)])
+    response = client.get("/api/projects", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-gzip"')
+    assert len(response.json()) == 5
+
+
+def test_write_invalidates_snapshot(client):
+    assert all(project["title"] != "REAL" for project in client.get("/api/projects").json())
+    client.post("/api/projects", json={key: value for key, value in REAL_PROJECT.items() if key != "id"})
+    assert any(project["title"] == "REAL" for project in client.get("/api/projects").json())
+
+
+def test_empty_collection_serves_defaults(client):
+    projects = client.get("/api/projects").json()
+    assert projects and all(project["title"] != "REAL" for project in projects)
+
+
+def test_failed_refresh_keeps_stale_snapshot(client, run, monkeypatch):
+    """Regression: a failed stale-while-revalidate refresh must not replace real content with defaults"""
+    run(db.projects.insert_one, dict(REAL_PROJECT))
+    monkeypatch.setattr(content_cache, "ttl", 0)
+    monkeypatch.setattr(content_cache, "stale_ttl", 60)
+    assert client.get("/api/projects").json()[0]["title"] == "REAL"
+
+    _fail_reads(monkeypatch)
+    for _ in range(3):
+        # Expired, so each request serves the stale entry and starts a refresh that fails
+        assert client.get("/api/projects").json()[0]["title"] == "REAL"
+        run(asyncio.sleep, 0.01)
+
+
+def test_fallback_is_not_cached_on_miss(client, run, monkeypatch):
+    """Regression: defaults served during an outage must not outlive it"""
+    run(db.projects.insert_one, dict(REAL_PROJECT))
+    with monkeypatch.context() as outage:
+        _fail_reads(outage)
+        assert all(project["title"] != "REAL" for project in client.get("/api/projects").json())
+        assert client.get("/api/bootstrap").json()["projects"][0]["title"] != "REAL"
+
+    assert client.get("/api/projects").json()[0]["title"] == "REAL"
+    assert client.get("/api/bootstrap").json()["projects"][0]["title"] == "REAL"
+
+
+def test_fallback_is_not_publicly_cacheable(client, run, monkeypatch):
+    """Regression: defaults served during an outage must not be kept by browsers or CDNs either"""
+    assert client.get("/api/projects").headers["cache-control"].startswith("public")
+    content_cache.clear()
+    with monkeypatch.context() as outage:
+        _fail_reads(outage)
+        assert client.get("/api/projects").headers["cache-control"] == "no-store"
+        assert client.get("/api/bootstrap").headers["cache-control"] == "no-store"
+
+    run(db.projects.insert_one, dict(REAL_PROJECT))
+    monkeypatch.setattr(content_cache, "ttl", 0)
+    monkeypatch.setattr(content_cache, "stale_ttl", 0)
+    assert client.get("/api/projects").headers["cache-control"].startswith("public")
+    with monkeypatch.context() as outage:
+        # Expired past its stale window: the last good snapshot is served, but as degraded
+        _fail_reads(outage)
+        response = client.get("/api/projects")
+        assert response.json()[0]["title"] == "REAL"
+        assert response.headers["cache-control"] == "no-store"
+
+
+@pytest.mark.parametrize("mode", ["gather", "aggregate"])
+def test_bootstrap_sections(client, run, monkeypatch, mode):
+    monkeypatch.setattr(settings, "BOOTSTRAP_FETCH_MODE", mode)
+    run(db.projects.insert_one, dict(REAL_PROJECT))
+    payload = client.get("/api/bootstrap?sections=projects,navLinks").json()
+    assert list(payload) == ["navLinks", "projects"]
+    assert payload["projects"][0]["title"] == "REAL"
+    assert client.get("/api/bootstrap?sections=nope").status_code == 400
+
+
+def test_failed_aggregate_falls_back_to_section_queries(client, run, monkeypatch):
+    monkeypatch.setattr(settings, "BOOTSTRAP_FETCH_MODE", "aggregate")
+    run(db.projects.insert_one, dict(REAL_PROJECT))
+
+    def down(*args, **kwargs):
+        raise RuntimeError("aggregate failed")
+    monkeypatch.setattr(memory_db.MemoryCollection, "aggregate", down)
+    assert client.get("/api/bootstrap").json()["projects"][0]["title"] == "REAL"
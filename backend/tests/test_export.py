@@ -0,0 +1,79 @@
+"""Streaming order export: escaping, projection, timestamps and cursor cleanup"""
+import csv
+import io
+import json
+from datetime import datetime
+
+from pymongo.errors import ServerSelectionTimeoutError
+
+from app.core import memory_db
+from app.core.database import db
+from app.routes import dashboard
+
+
+def _order(**fields):
+    return {
+        "status": "paid",
+        "total": 10,
+        "items": [],
+        "customerEmail": "Ann@Example.com",
+        "customerEmailLower": "ann@example.com",
+        "createdAt": datetime(2024, 5, 1, 12, 30),
+        **fields,
+    }
+
+
+def _csv_rows(response):
+    return list(csv.DictReader(io.StringIO(response.text)))
+
+
+def test_csv_cells_cannot_start_a_formula(client, run, admin_headers):
+    run(db.orders.insert_one, _order(customerName="=HYPERLINK(\"http://evil\")", customerPhone="+123", paymentMethod="@sum"))
+    rows = _csv_rows(client.get("/api/dashboard/orders/export", headers=admin_headers))
+    assert rows[0]["customerName"] == "'=HYPERLINK(\"http://evil\")"
+    assert rows[0]["customerPhone"] == "'+123"
+    assert rows[0]["paymentMethod"] == "'@sum"
+    assert rows[0]["total"] == "10"
+
+
+def test_export_projects_columns_and_formats_utc(client, run, admin_headers):
+    run(db.orders.insert_one, _order())
+    response = client.get("/api/dashboard/orders/export?format=ndjson", headers=admin_headers)
+    doc = json.loads(response.text.splitlines()[0])
+    assert "customerEmailLower" not in doc and "_id" not in doc
+    assert doc["customerEmail"] == "Ann@Example.com"
+    assert doc["createdAt"] == "2024-05-01T12:30:00+00:00"
+
+    row = _csv_rows(client.get("/api/dashboard/orders/export", headers=admin_headers))[0]
+    assert row["createdAt"] == "2024-05-01T12:30:00+00:00"
+
+
+def test_unreachable_database_is_a_503(client, admin_headers, monkeypatch):
+    async def down(self):
+        raise ServerSelectionTimeoutError("no servers")
+    monkeypatch.setattr(memory_db.MemoryCursor, "__anext__", down)
+    response = client.get("/api/dashboard/orders/export", headers=admin_headers)
+    assert response.status_code == 503
+
+
+def test_disconnect_closes_the_cursor(run, monkeypatch):
+    closed = []
+    close = memory_db.MemoryCursor.close
+
+    async def tracking_close(self):
+        closed.append(self)
+        await close(self)
+
+    monkeypatch.setattr(memory_db.MemoryCursor, "close", tracking_close)
+    monkeypatch.setattr(dashboard, "_EXPORT_CHUNK_ROWS", 1)
+    run(db.orders.insert_many, [_order(total=i) for i in range(3)])
+
+    async def read_one_chunk_then_disconnect():
+        cursor = db.orders.find({})
+        chunks = dashboard._export_chunks(await cursor.__anext__(), cursor, "ndjson")
+        await chunks.__anext__()
+        # What Starlette does with the body iterator when the client goes away
+        await chunks.aclose()
+
+    run(read_one_chunk_then_disconnect)
+    assert len(closed) == 1
@@ -0,0 +1,39 @@
+"""Index registry sync: create missing indexes, report drift without touching it"""
+import asyncio
+
+from pymongo import ASCENDING
+
+from app.core.indexes import INDEXES, sync_indexes
+from app.core.memory_db import MemoryClient
+
+
+def test_sync_reports_then_creates_missing_indexes():
+    async def scenario():
+        database = MemoryClient()["test"]
+        dry_run = await sync_indexes(database, apply=False)
+        assert len(dry_run["missing"]) == len(INDEXES) and not dry_run["created"]
+        assert await database.orders.index_information() == {"_id_": {"v": 2, "key": [("_id", 1)]}}
+
+        applied = await sync_indexes(database)
+        assert len(applied["created"]) == len(INDEXES)
+        again = await sync_indexes(database)
+        assert not any(again.values())
+
+    asyncio.run(scenario())
+
+
+def test_sync_reports_drift_without_fixing_it():
+    async def scenario():
+        database = MemoryClient()["test"]
+        # Same name, different definition; plus an index the registry does not know
+        await database.orders.create_index([("paymentSessionId", ASCENDING)], name="paymentSessionId_1", unique=True)
+        await database.orders.create_index([("legacyField", ASCENDING)], name="legacyField_1")
+
+        report = await sync_indexes(database)
+        assert [entry.split(" ")[0] for entry in report["conflicting"]] == ["orders.paymentSessionId_1"]
+        assert [entry.split(" ")[0] for entry in report["unmanaged"]] == ["orders.legacyField_1"]
+        assert len(report["created"]) == len(INDEXES) - 1
+        info = await database.orders.index_information()
+        assert info["paymentSessionId_1"].get("unique") and "legacyField_1" in info
+
+    asyncio.run(scenario())
@@ -0,0 +1,59 @@
+"""Admin order search by email prefix, customer name and gateway ID"""
+import pytest
+
+from app.core.database import db
+from app.core.indexes import sync_indexes
+from app.services.order_search_service import OrderSearchService
+
+
+def _order(email, name, session_id):
+    order = {"status": "paid", "total": 10, "items": [], "customerEmail": email, "customerName": name, "paymentSessionId": session_id}
+    return {**order, **OrderSearchService.search_fields(order)}
+
+
+@pytest.fixture
+def orders(run):
+    # The name search needs the customerName text index, as on a real server
+    run(sync_indexes, db)
+    run(db.orders.insert_many, [
+        _order(" Ann.Lee@Example.com", "Ann Lee", "cs_1"),
+        _order("annette@example.com", "Annette Park", "cs_2"),
+        _order("bob@example.com", "Bob Lee", "cs_3"),
+    ])
+
+
+def test_build_query_requires_a_criterion():
+    with pytest.raises(ValueError):
+        OrderSearchService.build_query(email=" ", name="", payment_id=None)
+
+
+def test_email_prefix_is_case_insensitive_and_literal():
+    query = OrderSearchService.build_query(email="  Ann.L")
+    # Lowercased and regex-escaped, anchored so it stays an index range scan
+    assert query == {"customerEmailLower": {"$regex": "^ann\\.l"}}
+
+
+def _search(client, admin_headers, **params):
+    response = client.get("/api/dashboard/orders/search", params=params, headers=admin_headers)
+    assert response.status_code == 200
+    return sorted(order["paymentSessionId"] for order in response.json())
+
+
+def test_search_endpoint(client, admin_headers, orders):
+    assert _search(client, admin_headers, email="ANN") == ["cs_1", "cs_2"]
+    assert _search(client, admin_headers, email="ann.") == ["cs_1"]
+    assert _search(client, admin_headers, name="lee") == ["cs_1", "cs_3"]
+    assert _search(client, admin_headers, name="lee", email="bob") == ["cs_3"]
+    assert _search(client, admin_headers, payment_id="cs_2") == ["cs_2"]
+
+
+def test_search_without_criteria_is_a_client_error(client, admin_headers):
+    response = client.get("/api/dashboard/orders/search", headers=admin_headers)
+    assert response.status_code == 400
+
+
+def test_backfill_fills_missing_lowercase_email(run):
+    run(db.orders.insert_one, {"customerEmail": " Old@Example.COM ", "items": []})
+    assert run(OrderSearchService.backfill) == 1
+    assert run(db.orders.find_one, {})["customerEmailLower"] == "old@example.com"
+    assert run(OrderSearchService.backfill) == 0
@@ -0,0 +1,112 @@
+"""Materialized order counters: increments, rebuild, revenue series and product performance"""
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.core.database import db
+from app.services.order_stats_service import OrderStatsService
+
+NOW = datetime.now(timezone.utc)
+
+
+def _order(status, total, days_ago=0, items=None):
+    return {
+        "status": status,
+        "total": total,
+        "createdAt": NOW - timedelta(days=days_ago),
+        "items": items or [{"productId": "p1", "name": "Widget", "price": total, "quantity": 1}],
+    }
+
+
+async def _create(order):
+    await db.orders.insert_one(order)
+    await OrderStatsService.record_created(order)
+    return str(order["_id"])
+
+
+def test_stats_aggregate_until_rebuilt(client, run, admin_headers):
+    run(db.orders.insert_many, [_order("paid", 10), _order("pending", 5), _order("failed", 7, days_ago=3)])
+    assert run(OrderStatsService.get_payment_stats, NOW) is None
+
+    stats = client.get("/api/dashboard/stats", headers=admin_headers).json()
+    assert stats["totalOrders"] == 3
+    assert stats["paidOrders"] == 1 and stats["totalRevenue"] == 10
+    assert stats["pendingOrders"] == 1 and stats["failedOrders"] == 1
+
+
+def test_counters_follow_creates_and_transitions(client, run, admin_headers):
+    run(db.orders.insert_one, _order("paid", 10, days_ago=2))
+    run(OrderStatsService.rebuild)
+    pending_id = run(_create, _order("pending", 5))
+    run(_create, _order("paid", 20))
+
+    response = client.put(f"/api/dashboard/orders/{pending_id}/status?status=paid", headers=admin_headers)
+    assert response.status_code == 200
+    # A repeated transition (e.g. a retried webhook) must not count twice
+    client.put(f"/api/dashboard/orders/{pending_id}/status?status=paid", headers=admin_headers)
+
+    incremental = client.get("/api/dashboard/stats", headers=admin_headers).json()
+    assert incremental["totalOrders"] == 3
+    assert incremental["paidOrders"] == 3 and incremental["totalRevenue"] == 35
+    assert incremental["pendingOrders"] == 0
+    assert incremental["todayOrders"] == 2 and incremental["todayRevenue"] == 25
+
+    run(OrderStatsService.rebuild)
+    assert client.get("/api/dashboard/stats", headers=admin_headers).json() == incremental
+
+
+def test_revenue_series_matches_before_and_after_rebuild(client, run, admin_headers):
+    run(db.orders.insert_many, [_order("paid", 10, days_ago=3), _order("pending", 5, days_ago=3), _order("paid", 7, days_ago=1)])
+    params = {"granularity": "day", "start": (NOW - timedelta(days=5)).isoformat(), "end": NOW.isoformat()}
+
+    # No rebuild yet: rollups are empty, so the series must come from the orders themselves
+    before = client.get("/api/dashboard/revenue", params=params, headers=admin_headers).json()
+    assert sum(point["revenue"] for point in before["points"]) == 17
+    assert sum(point["orders"] for point in before["points"]) == 3
+
+    run(OrderStatsService.rebuild)
+    after = client.get("/api/dashboard/revenue", params=params, headers=admin_headers).json()
+    assert after["points"] == before["points"]
+
+
+@pytest.mark.parametrize("granularity, span", [("hour", timedelta(hours=2001)), ("day", timedelta(days=2001)), ("month", timedelta(days=170 * 365))])
+def test_revenue_series_length_is_capped(client, admin_headers, granularity, span):
+    params = {"granularity": granularity, "start": (NOW - span).isoformat(), "end": NOW.isoformat()}
+    assert client.get("/api/dashboard/revenue", params=params, headers=admin_headers).status_code == 400
+
+
+def test_product_performance_counts_paid_units_and_conversion(client, run, admin_headers):
+    items = [{"productId": "p1", "name": "Widget", "price": 10, "quantity": 2}, {"productId": "p2", "name": "Gadget", "price": 5, "quantity": 1}]
+    run(OrderStatsService.rebuild)
+    run(_create, _order("paid", 25, items=items))
+    pending_id = run(_create, _order("pending", 10, items=items[:1]))
+
+    report = client.get("/api/dashboard/products/performance", headers=admin_headers).json()
+    products = {product["productId"]: product for product in report["products"]}
+    assert products["p1"]["orders"] == 2 and products["p1"]["units"] == 2 and products["p1"]["revenue"] == 20
+    assert products["p1"]["conversion"] == 0.5
+    assert products["p2"]["conversion"] == 1.0
+
+    client.put(f"/api/dashboard/orders/{pending_id}/status?status=paid", headers=admin_headers)
+    incremental = client.get("/api/dashboard/products/performance", headers=admin_headers).json()
+    assert incremental["products"][0]["productId"] == "p1"
+    assert incremental["products"][0]["units"] == 4
+
+    run(OrderStatsService.rebuild)
+    assert client.get("/api/dashboard/products/performance", headers=admin_headers).json() == incremental
+
+
+def test_product_sales_rebuild_skips_lines_without_product(client, run, admin_headers):
+    """Regression: the rebuild must not create a "None" product, and must pick names deterministically"""
+    run(OrderStatsService.rebuild)
+    run(_create, _order("paid", 10, days_ago=1, items=[{"productId": "p1", "name": "Old name", "price": 10, "quantity": 1}]))
+    run(_create, _order("paid", 15, items=[
+        {"productId": "p1", "name": "New name", "price": 10, "quantity": 1},
+        {"productId": None, "name": "Shipping", "price": 5, "quantity": 1},
+    ]))
+    incremental = client.get("/api/dashboard/products/performance", headers=admin_headers).json()
+    assert [product["productId"] for product in incremental["products"]] == ["p1"]
+    assert incremental["products"][0]["name"] == "New name"
+
+    run(OrderStatsService.rebuild)
+    assert run(db.product_sales.find_one, {"productId": "None"}) is None
+    assert client.get("/api/dashboard/products/performance", headers=admin_headers).json() == incremental
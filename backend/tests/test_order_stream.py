@@ -0,0 +1,67 @@
+"""Order event stream: stream-token auth and server-sent event framing"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.auth import STREAM_TOKEN_ROLE, create_access_token, create_stream_token, get_stream_admin
+from app.core.config import settings
+from app.routes.dashboard import _order_event_stream
+from app.services.order_events import order_events
+
+STREAM_URL = "/api/dashboard/orders/stream"
+
+
+def _expired_stream_token():
+    payload = {"sub": "admin", "role": STREAM_TOKEN_ROLE, "exp": datetime.now(timezone.utc) - timedelta(seconds=1)}
+    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+
+
+def test_stream_token_is_issued_to_admins_only(client, admin_headers):
+    assert client.post("/api/dashboard/orders/stream-token").status_code == 401
+    body = client.post("/api/dashboard/orders/stream-token", headers=admin_headers).json()
+    assert jwt.decode(body["token"], settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])["role"] == STREAM_TOKEN_ROLE
+
+
+def test_stream_rejects_bad_credentials(client):
+    # Rejected before the response starts, so these never open the stream
+    assert client.get(STREAM_URL).status_code == 401
+    assert client.get(STREAM_URL, params={"token": "garbage"}).status_code == 401
+    assert client.get(STREAM_URL, params={"token": _expired_stream_token()}).status_code == 401
+    # The long-lived admin JWT must not be accepted in the URL
+    assert client.get(STREAM_URL, params={"token": create_access_token("admin")}).status_code == 403
+
+
+def test_stream_token_only_opens_the_stream(client):
+    headers = {"Authorization": f"Bearer {create_stream_token('admin')}"}
+    assert client.get("/api/dashboard/orders", headers=headers).status_code == 403
+    assert client.get(STREAM_URL, headers=headers).status_code == 403
+
+
+def test_stream_accepts_a_stream_token(run):
+    payload = run(get_stream_admin, create_stream_token("admin"), None)
+    assert payload["sub"] == "admin"
+    bearer = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token("admin"))
+    assert run(get_stream_admin, None, bearer)["role"] == "admin"
+    with pytest.raises(HTTPException):
+        run(get_stream_admin, None, None)
+
+
+def test_event_stream_frames_and_unsubscribes(run):
+    async def first_event():
+        stream = _order_event_stream()
+        assert await stream.__anext__() == "retry: 5000\n\n"
+        order_events.status_changed({"_id": "o1", "status": "pending", "total": 5}, "paid")
+        frame = await stream.__anext__()
+        await stream.aclose()
+        return frame
+
+    frame = run(first_event)
+    event_line, data_line = frame.strip().split("\n")
+    assert event_line == "event: order.status_changed"
+    event = json.loads(data_line[len("data: "):])
+    assert event["order"]["status"] == "paid" and event["previousStatus"] == "pending"
+    assert order_events.subscriber_count == 0
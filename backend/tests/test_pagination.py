@@ -0,0 +1,69 @@
+"""Keyset cursor pagination of order listings"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.database import db
+from app.core.pagination import InvalidCursor, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, fetch_page
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _orders(count):
+    # Pairs share a createdAt, so the _id tie-breaker is exercised too
+    return [{"status": "pending", "total": i, "items": [], "createdAt": NOW - timedelta(minutes=i // 2)} for i in range(count)]
+
+
+def test_pages_cover_every_order_once(run):
+    run(db.orders.insert_many, _orders(7))
+    seen, cursor = [], None
+    while True:
+        docs, cursor = run(fetch_page, db.orders, {}, 3, cursor)
+        seen.extend(docs)
+        if cursor is None:
+            break
+    assert len(seen) == 7
+    assert len({doc["_id"] for doc in seen}) == 7
+    keys = [(doc["createdAt"], doc["_id"]) for doc in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_last_full_page_has_no_cursor(run):
+    run(db.orders.insert_many, _orders(3))
+    docs, cursor = run(fetch_page, db.orders, {}, 3, None)
+    assert len(docs) == 3 and cursor is None
+
+
+def test_cursor_round_trip():
+    doc = {"_id": "abc", "createdAt": NOW}
+    assert decode_cursor(encode_cursor(doc)) == (NOW, "abc")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+def test_fetch_page_rejects_non_positive_limit(run):
+    with pytest.raises(ValueError):
+        run(fetch_page, db.orders, {}, 0, None)
+
+
+def test_dashboard_orders_paging(client, run, admin_headers):
+    run(db.orders.insert_many, _orders(5))
+    first = client.get("/api/dashboard/orders?limit=3", headers=admin_headers)
+    assert first.status_code == 200 and len(first.json()) == 3
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+
+    second = client.get("/api/dashboard/orders", params={"limit": 3, "cursor": cursor}, headers=admin_headers)
+    assert len(second.json()) == 2
+    assert NEXT_CURSOR_HEADER not in second.headers
+    assert not {order["id"] for order in first.json()} & {order["id"] for order in second.json()}
+
+
+@pytest.mark.parametrize("limit", [0, -1, 501])
+def test_out_of_range_limit_is_rejected(client, admin_headers, limit):
+    assert client.get(f"/api/orders?limit={limit}").status_code == 422
+    assert client.get(f"/api/dashboard/orders?limit={limit}", headers=admin_headers).status_code == 422
+
+
+def test_invalid_cursor_is_a_client_error(client, admin_headers):
+    assert client.get("/api/orders?cursor=garbage").status_code == 400
+    assert client.get("/api/dashboard/orders?cursor=garbage", headers=admin_headers).status_code == 400
@@ -0,0 +1,54 @@
+"""Static snapshot mode: export, load and serve without MongoDB"""
+import json
+
+import pytest
+
+from app.core import memory_db
+from app.core.defaults import defaults
+from app.core.database import db
+from app.core.static_snapshot import MANIFEST_NAME, load_static_snapshots
+from app.routes.bootstrap import _SECTIONS
+from export_static import DefaultContentError, export_static
+
+
+def _fail_reads(monkeypatch):
+    def down(*args, **kwargs):
+        raise RuntimeError("MongoDB is down")
+    for method in ("find", "find_one", "aggregate"):
+        monkeypatch.setattr(memory_db.MemoryCollection, method, down)
+
+
+async def _seed_all():
+    """Store real content in every collection the export reads"""
+    for collection, _ in _SECTIONS.values():
+        content = json.loads(defaults.snapshot(collection).body)
+        if isinstance(content, list):
+            await db[collection].insert_many(content)
+        else:
+            await db[collection].insert_one(content)
+    await db.projects.update_many({}, {"$set": {"title": "REAL"}})
+
+
+def test_exported_snapshots_are_served_without_mongodb(client, run, tmp_path, monkeypatch):
+    run(_seed_all)
+    run(export_static, tmp_path)
+    live = client.get("/api/projects")
+
+    assert load_static_snapshots(str(tmp_path)) == len(json.loads((tmp_path / MANIFEST_NAME).read_text()))
+    _fail_reads(monkeypatch)
+    static = client.get("/api/projects")
+    assert static.content == live.content and static.headers["etag"] == live.headers["etag"]
+    assert static.headers["cache-control"].startswith("public")
+    payload = client.get("/api/bootstrap?sections=projects").json()
+    assert list(payload) == ["projects"] and payload["projects"][0]["title"] == "REAL"
+
+
+def test_export_refuses_default_content(run, tmp_path, monkeypatch):
+    # Empty database: every loader would hand back defaults
+    with pytest.raises(DefaultContentError):
+        run(export_static, tmp_path)
+    run(_seed_all)
+    _fail_reads(monkeypatch)
+    with pytest.raises(DefaultContentError):
+        run(export_static, tmp_path)
+    assert not (tmp_path / MANIFEST_NAME).exists()